@@ -3,39 +3,162 @@
 
 """Async Wialon Remote API client implementation"""
 
+# pylint: disable=too-many-lines
+
 import asyncio
+import difflib
 import json
+import sys
+import time
 import warnings
-from contextlib import suppress
-from functools import wraps
-from typing import Callable, Coroutine, Dict, Optional, Any, Union, Literal, List
+from contextlib import asynccontextmanager, contextmanager, nullcontext, suppress
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from typing import (Callable, Coroutine, Dict, Optional, Any, Union, Literal, List, Tuple,
+                    Iterable, FrozenSet, ContextManager, Sequence, AsyncIterator, Iterator)
 from urllib.parse import urljoin
 
 import aiohttp
 from aiolimiter import AsyncLimiter
 
-from aiowialon.exceptions import WialonError, WialonRequestLimitExceededError, WialonWarning
+from aiowialon.exceptions import (WialonError, WialonInvalidResult, WialonInvalidSession,
+                                  WialonReachedConcurrentRequestLimit,
+                                  WialonRequestLimitExceededError,
+                                  WialonSessionExpiredOrIPChangedError, WialonWarning)
 from aiowialon.logger import logger, aiohttp_trace_config
-from aiowialon.types import (AvlEventHandler, AvlEventFilter, AvlEvent,
-                             AvlEventCallback, LogoutCallback)
-from aiowialon.types import LoginParams, LoginCallback, flags, MultipartField
+from aiowialon.types import (AvlEventHandler, AvlEventFilter, AvlEvent, AvlEventBatch,
+                             AvlEventSpec, AvlEventRouter, AvlEventCallback, LogoutCallback)
+from aiowialon.types import LoginParams, LoginCallback, flags, MultipartField, WialonCall
 from aiowialon.utils.async_lock import ExclusiveAsyncLock
+from aiowialon.utils.batching import CallBatcher, split_batch
+from aiowialon.utils.cache import ResponseCache
+from aiowialon.utils.concurrency import ConcurrencyLimiter
+from aiowialon.utils.endpoints import EndpointPool
+from aiowialon.utils.events import EventQueue
+from aiowialon.utils.limiter import AdaptiveRateLimiter, is_throttling_error
+from aiowialon.utils.offload import ProcessOffload
+from aiowialon.utils.polling import PollingCadence
+from aiowialon.utils.recording import EventsRecorder, EventsReplay
+from aiowialon.utils.retry import RetryPolicy
+from aiowialon.utils.scheduler import (PriorityScheduler, RequestPriority, request_priority,
+                                       current_priority)
+from aiowialon.utils.timeouts import request_timeout, has_custom_timeout, effective_timeout
+from aiowialon.utils.services import WIALON_ACTIONS
+from aiowialon.utils.sessions import SessionPool, current_affinity, session_affinity
+from aiowialon.utils.singleflight import SingleFlight
+from aiowialon.utils.store import ItemStore
 from aiowialon.utils import convention
 from aiowialon.utils.compat import Unpack
 from aiowialon.validators import WialonCallRespValidator
 
 
-# pylint: disable=too-many-instance-attributes
+# set while the lost session is reopened, the calls made meanwhile are not recovered again
+_reopening_session: ContextVar[bool] = ContextVar('_reopening_session', default=False)
+
+
+# pylint: disable=too-many-instance-attributes,too-many-public-methods
 class Wialon:
     """
     Async Wialon Remote API client implementation,
     use this for open connection and communicate with Wialon
     """
 
-    # pylint: disable=too-many-arguments
+    # Calls that are always sent directly, even if automatic batching is enabled
+    NON_BATCHABLE_ACTIONS = frozenset({
+        'token_login',
+        'core_use_auth_hash',
+        'core_logout',
+        'core_batch',
+        'core_duplicate',
+    })
+
+    # Calls that change or read the session state used by polling,
+    # they are always sent with the primary session of SessionPool
+    PRIMARY_SESSION_ACTIONS = frozenset({
+        'token_login',
+        'core_use_auth_hash',
+        'core_logout',
+        'core_duplicate',
+        'core_update_data_flags',
+        'core_set_session_property',
+        'avl_evts',
+    })
+
+    # Calls opening or closing the session, they are never replayed with the reopened session
+    SESSION_CONTROL_ACTIONS = frozenset({
+        'token_login',
+        'core_use_auth_hash',
+        'core_logout',
+        'core_duplicate',
+    })
+
+    # Default limits of the single 'core/batch' request, bigger batches are split to chunks,
+    # None to send the batch as is unless the limits are passed to 'Wialon.batch'
+    BATCH_CHUNK_SIZE: Optional[int] = None
+    BATCH_CHUNK_BYTES: Optional[int] = None
+
+    # Side-effect free calls, that can be shared between concurrent callers
+    READ_ONLY_ACTIONS = frozenset({
+        'core_search_item',
+        'core_search_items',
+        'core_get_account_data',
+        'core_get_hw_types',
+        'core_get_hw_cmds',
+        'core_check_unique',
+        'core_check_items_billing',
+        'core_check_accessors',
+        'user_get_items_access',
+        'user_get_locale',
+        'user_get_dst_time',
+        'resource_get_zone_data',
+        'resource_get_zones_by_point',
+        'resource_get_job_data',
+        'resource_get_notification_data',
+        'resource_get_driver_bindings',
+        'resource_get_unit_drivers',
+        'resource_get_trailer_bindings',
+        'resource_get_unit_trailers',
+        'resource_get_tag_bindings',
+        'account_get_account_data',
+        'account_get_billing_plans',
+        'unit_get_command_definition_data',
+        'unit_get_fuel_settings',
+        'unit_get_report_settings',
+        'unit_get_trips',
+        'unit_calc_sensors',
+        'unit_calc_last_message',
+        'unit_get_trip_detector',
+        'route_get_round_data',
+        'route_get_all_rounds',
+        'token_list',
+        'file_list',
+    })
+
+    # pylint: disable=too-many-arguments,too-many-locals
     def __init__(self, scheme: Literal['https', 'http'] = 'https',
                  host: str = "hst-api.wialon.com", port: Optional[int] = None,
-                 token: Optional[str] = None, rps: int = 10):
+                 token: Optional[str] = None, rps: int = 10, *,
+                 limit_per_host: int = 10,
+                 keepalive_timeout: float = 30,
+                 ttl_dns_cache: Optional[int] = 300,
+                 auto_batch: bool = False,
+                 auto_batch_delay: float = 0.05,
+                 auto_batch_size: int = 50,
+                 single_flight: bool = False,
+                 single_flight_actions: Optional[Iterable[str]] = None,
+                 cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 priority_weights: Optional[Dict[RequestPriority, int]] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 max_concurrency: int = 10,
+                 concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+                 strict_actions: bool = False,
+                 sessions: Optional[SessionPool] = None,
+                 endpoints: Optional[EndpointPool] = None,
+                 auto_relogin: bool = False,
+                 event_queue: Optional[EventQueue] = None,
+                 events_recorder: Optional[EventsRecorder] = None,
+                 item_store: Optional[ItemStore] = None):
         """
         Creates the Wialon API client instance.
         :param scheme: 'https/http'
@@ -43,6 +166,34 @@ class Wialon:
         :param port: Port of the Wialon server where an API endpoint placed
         :param token: Wialon API Token
         :param rps: Max requests per second
+        :param limit_per_host: Max simultaneous connections kept to the API host
+        :param keepalive_timeout: Seconds to keep an idle connection open for reuse
+        :param ttl_dns_cache: Seconds to cache resolved host addresses, None to cache forever
+        :param auto_batch: Collect concurrent calls to 'core/batch' requests automatically
+        :param auto_batch_delay: Seconds to collect the calls before the batch is sent
+        :param auto_batch_size: Max calls in automatic batch, the batch is sent on reaching it
+        :param single_flight: Share one request between concurrent identical read-only calls
+        :param single_flight_actions: Actions allowed to be shared,
+                                      defaults to Wialon.READ_ONLY_ACTIONS
+        :param cache: Response cache for idempotent calls
+        :param rate_limiter: Adaptive requests rate limiter, replaces the fixed 'rps' limit
+        :param priority_weights: Share of the rate limit by request priority class
+        :param retry: Retry policy for transient failures,
+                      retries Wialon.READ_ONLY_ACTIONS if its actions are not set
+        :param max_concurrency: Max requests in flight
+        :param concurrency_limiter: Custom or adaptive requests in flight limiter,
+                                    replaces the fixed 'max_concurrency' limit
+        :param strict_actions: Raise AttributeError on Wialon.<action_name> access
+                               for actions missing in the WIALON_ACTIONS registry
+        :param sessions: Pool of additional sessions opened on login to spread the calls over
+        :param endpoints: Multiple Wialon hosts with failover, replaces scheme/host/port
+        :param auto_relogin: Reopen the expired session and replay the failed calls,
+                             restores 'core/update_data_flags' subscriptions
+        :param event_queue: Bounded queue between polling and AVL event handlers,
+                            the handlers are awaited by its workers instead of separate tasks
+        :param events_recorder: Records the raw 'avl_evts' responses received by polling
+        :param item_store: Local copy of the items subscribed with 'core/update_data_flags',
+                           kept current by the polled AVL events
         """
 
         self._sid: Optional[str] = None
@@ -50,20 +201,81 @@ class Wialon:
         self._timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=5)
 
         self.__base_url = f"{scheme}://{host}:{port if port else 443 if scheme == 'https' else 80}"
-        self.__base_api_url: str = urljoin(self.__base_url, 'wialon/ajax.html')
+        self.__api_path: str = 'wialon/ajax.html'
+        self.__endpoints: Optional[EndpointPool] = endpoints
+        self.__health_task: Optional[asyncio.Task] = None
+        self.__login_params: Optional[Dict[str, Any]] = None
+        self.__user_id: Optional[int] = None
+        self.__relogin_lock: asyncio.Lock = asyncio.Lock()
+        self.__relogin_failed: Optional[Tuple[str, float]] = None
+        self.__auto_relogin: bool = auto_relogin
+        self.__subscriptions: Dict[str, Dict[str, Any]] = {}
+
+        self.__strict_actions: bool = strict_actions
 
         self.__avl_event_handlers: Dict[str, AvlEventHandler] = {}
+        self.__avl_event_router: AvlEventRouter = AvlEventRouter()
         self.__on_session_open: Optional[LoginCallback] = None
         self.__on_session_close: Optional[LogoutCallback] = None
 
         self.__polling_lock: asyncio.Lock = asyncio.Lock()
         self.__polling_task: Optional[asyncio.Task] = None
-
-        self.__semaphore: asyncio.Semaphore = asyncio.Semaphore(10)
-        self.__limiter: AsyncLimiter = AsyncLimiter(rps, 1)
+        self.__event_queue: Optional[EventQueue] = event_queue
+        self.__events_recorder: Optional[EventsRecorder] = events_recorder
+        self.__item_store: Optional[ItemStore] = item_store
+        self.__event_streams: List[Tuple[EventQueue, Optional[AvlEventSpec],
+                                         Optional[AvlEventFilter]]] = []
+
+        self.__concurrency: ConcurrencyLimiter = (
+            concurrency_limiter if concurrency_limiter is not None
+            else ConcurrencyLimiter(max_concurrency)
+        )
+        self.__scheduler: PriorityScheduler = PriorityScheduler(priority_weights)
+        self.__limiter: Union[AsyncLimiter, AdaptiveRateLimiter] = (
+            rate_limiter if rate_limiter is not None else AsyncLimiter(rps, 1)
+        )
 
         self.__exclusive_session_lock: ExclusiveAsyncLock = ExclusiveAsyncLock()
 
+        self.__connector_params: Dict[str, Any] = {
+            'limit_per_host': limit_per_host,
+            'keepalive_timeout': keepalive_timeout,
+            'ttl_dns_cache': ttl_dns_cache,
+        }
+        self.__session: Optional[aiohttp.ClientSession] = None
+
+        self.__batcher: Optional[CallBatcher] = None
+        if auto_batch:
+            self.__batcher = CallBatcher(self._send_auto_batch,
+                                         auto_batch_delay, auto_batch_size)
+
+        self.__single_flight: Optional[SingleFlight] = None
+        self.__single_flight_actions: FrozenSet[str] = frozenset(
+            self.READ_ONLY_ACTIONS if single_flight_actions is None else single_flight_actions
+        )
+        if single_flight:
+            self.__single_flight = SingleFlight()
+
+        self.__cache: Optional[ResponseCache] = cache
+
+        self.__retry: Optional[RetryPolicy] = retry
+        if retry is not None and retry.actions is None:
+            retry.actions = self.READ_ONLY_ACTIONS
+
+        self.__sessions: Optional[SessionPool] = sessions
+        self.__primary_svcs: FrozenSet[str] = frozenset(
+            convention.prepare_action_name(action) for action in self.PRIMARY_SESSION_ACTIONS
+        )
+
+    async def __aenter__(self) -> 'Wialon':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        try:
+            await self.logout()
+        finally:
+            await self.close()
+
     @property
     def token(self) -> Optional[str]:
         """Get current Wialon Remote API access token"""
@@ -90,6 +302,106 @@ class Wialon:
             raise TypeError("timeout must be an instance of (int, float")
         self._timeout = aiohttp.ClientTimeout(timeout)
 
+    @property
+    def rate_limiter(self) -> Optional[AdaptiveRateLimiter]:
+        """Get the adaptive rate limiter to inspect its current rate"""
+
+        if isinstance(self.__limiter, AdaptiveRateLimiter):
+            return self.__limiter
+        return None
+
+    @property
+    def concurrency_limiter(self) -> ConcurrencyLimiter:
+        """Get the requests in flight limiter to inspect or change its limit"""
+
+        return self.__concurrency
+
+    @property
+    def scheduler(self) -> PriorityScheduler:
+        """Get the requests scheduler to inspect the queues by priority"""
+
+        return self.__scheduler
+
+    @staticmethod
+    def request_priority(priority: RequestPriority) -> ContextManager[None]:
+        """
+        Context manager to set the priority of the requests made in its scope,
+        the calls are admitted to the rate limiter by priority classes
+
+        >>> # Example
+        >>> with wialon.request_priority(RequestPriority.BULK):
+        >>>     await asyncio.gather(*[wialon.core_search_item(id=i, flags=1) for i in ids])
+        """
+
+        return request_priority(priority)
+
+    @property
+    def retry(self) -> Optional[RetryPolicy]:
+        """Get the retry policy"""
+
+        return self.__retry
+
+    @staticmethod
+    def request_timeout(timeout: Optional[float] = None,
+                        deadline: Optional[float] = None) -> ContextManager[None]:
+        """
+        Context manager to set the timeouts of the requests made in its scope
+        without affecting the concurrent calls
+        :param timeout: Timeout in seconds for each request
+        :param deadline: Time budget in seconds for all the requests (and retries) in the scope
+
+        >>> # Example
+        >>> with wialon.request_timeout(600):
+        >>>     await wialon.report_exec_report(**params)
+        """
+
+        return request_timeout(timeout, deadline)
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """Get the response cache, use it for invalidation and hit/miss stats"""
+
+        return self.__cache
+
+    @property
+    def sessions(self) -> Optional[SessionPool]:
+        """Get the sessions pool to inspect the sessions load"""
+
+        return self.__sessions
+
+    @property
+    def event_queue(self) -> Optional[EventQueue]:
+        """Get the AVL events queue to inspect its depth and overflow counters"""
+
+        return self.__event_queue
+
+    @property
+    def item_store(self) -> Optional[ItemStore]:
+        """Get the local store of the subscribed items"""
+
+        return self.__item_store
+
+    @property
+    def endpoints(self) -> Optional[EndpointPool]:
+        """Get the endpoints pool to inspect the hosts state"""
+
+        return self.__endpoints
+
+    @staticmethod
+    def session_affinity() -> ContextManager[None]:
+        """
+        Context manager to send all the calls made in its scope with the same session,
+        if the sessions pool is used. Required for the flows keeping state in the session
+
+        >>> # Example
+        >>> with wialon.session_affinity():
+        >>>     await wialon.report_exec_report(**params)
+        >>>     rows = await wialon.report_get_result_rows(tableIndex=0, indexFrom=0, indexTo=10)
+        >>>     await wialon.report_cleanup_result()
+        """
+
+        return session_affinity()
+
     @property
     def session_lock(self) -> Callable:
         """
@@ -143,10 +455,22 @@ class Wialon:
         self.__on_session_close = callback
         return callback
 
-    def avl_event_handler(self, filter_: Optional[AvlEventFilter] = None) -> Callable:
+    def avl_event_handler(self, filter_: Optional[AvlEventFilter] = None,
+                          max_concurrency: Optional[int] = None,
+                          spec: Optional[AvlEventSpec] = None,
+                          offload: Optional[ProcessOffload] = None) -> Callable:
         """
         Decorator to register multiple AVL event handlers for current Wialon instance
         Set callback and filter function to catch and process AVL events
+        :param max_concurrency: Max handler executions at the same time, unlimited if None
+        :param spec: Declarative filter by items, event types and message types,
+                     indexed, so the event is checked only by the handlers it can match
+        :param offload: Process the event in a worker process first,
+                        the callback gets the event and the result
+
+        >>> @wialon.avl_event_handler(spec=AvlEventSpec(items={734455}, types={'m'}))
+        >>> async def unit_message(event: AvlEvent):
+        >>>     print(event.data.d['pos'])
         """
 
         def wrapper(callback: AvlEventCallback):
@@ -160,10 +484,11 @@ class Wialon:
             >>>     await wialon.avl_evts(event)
             >>>     unit_event.unregister()  # to be honest that executes just once
             """
-            handler = AvlEventHandler(callback, filter_)
+            handler = AvlEventHandler(callback, filter_, max_concurrency, spec, offload)
             if callback.__name__ in self.__avl_event_handlers:
                 raise KeyError(f"Detected AVLEventHandler duplicate {callback.__name__}")
             self.__avl_event_handlers[callback.__name__] = handler
+            self.__avl_event_router.add(handler)
             return callback
 
         return wrapper
@@ -191,17 +516,97 @@ class Wialon:
             callback = callback.__name__
         if isinstance(callback, str):
             handler = self.__avl_event_handlers.pop(callback)
+            self.__avl_event_router.remove(handler)
             handler.cleanup()
         else:
             warnings.warn(f"Can't remove AVL event handler: {callback}")
 
-    async def _process_event_handlers(self, event: AvlEvent) -> None:
-        """Process event handlers for current item"""
+    async def _process_event_handlers(self, event: AvlEvent, detached: bool = True) -> None:
+        """
+        Process event handlers for current item
+        :param detached: Execute handler callback in a separate task, otherwise await it
+        """
 
-        for _, handler in self.__avl_event_handlers.items():
-            if await handler(event):
+        for handler in self.__avl_event_router.candidates(event):
+            if await handler(event, detached):
                 break
 
+    async def _event_worker(self, queue: EventQueue, worker: int) -> None:
+        """Handles the events from the queue one by one"""
+
+        while True:
+            event = await queue.get(worker)
+            if event is None:
+                # the queue is closed and drained
+                return
+            try:
+                await self._process_event_handlers(event, detached=False)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # the worker have to survive the failed handler
+                logger.exception(e)
+            finally:
+                queue.task_done()
+
+    async def events(self, batch_size: int = 100,
+                     filter_: Optional[AvlEventFilter] = None,
+                     spec: Optional[AvlEventSpec] = None,
+                     queue: Optional[EventQueue] = None) -> AsyncIterator[List[AvlEvent]]:
+        """
+        Async iterator over the batches of the polled AVL events,
+        an alternative to the handlers for the consumers pulling the events at their own pace.
+        Subscribes on the first iteration and ends when polling stops.
+        If the consumer falls behind, the queue overflow policy is applied,
+        'block' one slows the polling down
+        :param batch_size: Max events in a batch, the batch includes the events already queued
+        :param filter_: Filter function applied after the spec
+        :param spec: Declarative filter
+        :param queue: Queue of the stream, EventQueue(10000, overflow='block') by default
+
+        >>> async with contextlib.aclosing(wialon.events(batch_size=500)) as batches:
+        >>>     async for batch in batches:
+        >>>         await bulk_write(batch)
+        """
+
+        if batch_size < 1:
+            raise ValueError("Events batch_size have to be >= 1")
+        stream = (queue if queue is not None else EventQueue(), spec, filter_)
+        self.__event_streams.append(stream)
+        try:
+            while batch := await stream[0].get_batch(batch_size):
+                yield batch
+                stream[0].task_done(len(batch))
+        finally:
+            self.__event_streams.remove(stream)
+            stream[0].close()
+
+    async def event_stream(self, filter_: Optional[AvlEventFilter] = None,
+                           spec: Optional[AvlEventSpec] = None,
+                           queue: Optional[EventQueue] = None) -> AsyncIterator[AvlEvent]:
+        """
+        Async iterator over the polled AVL events one by one, see 'events'
+
+        >>> async for event in wialon.event_stream(spec=AvlEventSpec(types={'m'})):
+        >>>     print(event.data.i)
+        """
+
+        batches = self.events(1, filter_, spec, queue)
+        try:
+            async for batch in batches:
+                yield batch[0]
+        finally:
+            await batches.aclose()
+
+    async def _publish_events(self, events: Sequence[AvlEvent]) -> None:
+        """Puts the events to the queues of the streams accepting them"""
+
+        for queue, spec, filter_ in list(self.__event_streams):
+            for event in events:
+                if spec is not None and not spec.matches(event):
+                    continue
+                if filter_ is not None and not filter_(event):
+                    continue
+                await queue.put(event)
+
     async def _cleanup_event_handlers(self) -> None:
         """Cleanup event handlers"""
 
@@ -210,10 +615,16 @@ class Wialon:
 
     async def start_polling(self, timeout: Union[int, float] = 2,
                             logout_finally: bool = True,
+                            cadence: Optional[PollingCadence] = None,
                             **params: Unpack[LoginParams]) -> None:
-        """Open session and start polling avl events"""
+        """
+        Open session and start polling avl events
+        :param timeout: Fixed delay in seconds between the polling requests
+        :param logout_finally: Logout when polling stopped
+        :param cadence: Adaptive delay between the polling requests, replaces the fixed 'timeout'
+        """
 
-        if timeout < 1:
+        if cadence is None and timeout < 1:
             raise ValueError("Poling timeout have to be >= 1 second. "
                              "No more than 10 'avl_evts' requests "
                              "can be processed during 10 seconds")
@@ -221,7 +632,7 @@ class Wialon:
         async with self.__polling_lock:
 
             await self.login(**params)
-            self.__polling_task = asyncio.create_task(self._polling(timeout))
+            self.__polling_task = asyncio.create_task(self._polling(timeout, cadence))
             logger.info("Polling task started")
             try:
                 await self.__polling_task
@@ -258,7 +669,9 @@ class Wialon:
             raise ValueError("You can't use both token and auth_hash "
                              "at the same time on login")
 
-        logger.info('Wialon login: %s', self.__base_url)
+        logger.info('Wialon login: %s', self.__base_url if self.__endpoints is None
+                    else self.__endpoints.active.url)
+        self.__login_params = dict(params)
         if auth_hash:
             session_login = await self.core_use_auth_hash(**params)
         else:
@@ -269,36 +682,259 @@ class Wialon:
 
         if isinstance(session_login, dict):
             self._sid = session_login['eid']
+            # the cached responses depend on the user access rights
+            self.__user_id = (session_login.get('user') or {}).get('id')
             logger.debug("sid: %s", self._sid)
             logger.info("Wialon session opened")
         else:
             raise TypeError(f"Unexpected login response: {session_login}")
+        if self.__sessions is not None:
+            await self._open_pool_sessions(params)
         if self.__on_session_open:
             await self.__on_session_open(session_login)
         return session_login
 
     async def logout(self) -> Any:
-        """Attempt to logout"""
+        """Attempt to logout, closes the connection pool after the session closed"""
 
         if self._sid:
             logger.info("Wialon logout")
-            session_logout = await self.core_logout()
-            self._sid = None
+            try:
+                await self._close_pool_sessions()
+                session_logout = await self.core_logout()
+            finally:
+                self._sid = None
+                self.__user_id = None
+                self.__subscriptions.clear()
+                if self.__item_store is not None:
+                    self.__item_store.clear()
+                await self.close()
             if self.__on_session_close:
                 await self.__on_session_close(session_logout)
             return session_logout
+        return None
+
+    async def _open_pool_sessions(self, params: Dict[str, Any]) -> None:
+        """Opens the additional sessions of the pool for the primary one"""
+
+        pool = self.__sessions
+        await self._close_pool_sessions()
+        pool.open(self._sid)
+        for _ in range(pool.size - 1):
+            if not await self._open_pool_session(params):
+                break
+        logger.info("Wialon sessions pool opened: %d sessions", len(pool.sessions))
+
+    async def _open_pool_session(self, params: Dict[str, Any]) -> bool:
+        """Opens the additional session of the pool, returns True if opened"""
+
+        pool = self.__sessions
+        if pool.duplicate or not self.token:
+            call = WialonCall('core_duplicate', {'continueCurrentSession': True})
+            payload = call.payload(self._sid)
+        else:
+            call = WialonCall('token_login', params)
+            payload = call.payload(None)
+        try:
+            session_login = await self.request(call.action_name, self.__api_path, payload)
+        except (WialonError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+            logger.warning("Can't open additional Wialon session: %r", err)
+            return False
+        pool.add(session_login['eid'])
+        return True
+
+    async def _replace_pool_session(self, sid: str) -> None:
+        """Replaces the lost additional session of the pool, keeping the primary one"""
+
+        pool = self.__sessions
+        if pool is None or sid not in pool.extra:
+            # already replaced by the concurrent caller
+            return
+        pool.remove(sid)
+        logger.warning("Replacing lost additional Wialon session")
+        await self._open_pool_session(self.__login_params or {})
+
+    async def _close_pool_sessions(self) -> None:
+        """Logouts the additional sessions of the pool"""
+
+        if self.__sessions is None:
+            return
+        extra = self.__sessions.extra
+        self.__sessions.clear()
+        for sid in extra:
+            call = WialonCall('core_logout')
+            with suppress(WialonError, aiohttp.ClientError, asyncio.TimeoutError):
+                await self.request(call.action_name, self.__api_path, call.payload(sid))
+
+    async def close(self) -> None:
+        """
+        Close the underlying connection pool and the process offloads of the handlers,
+        they will be reopened lazily on the next request or event
+        """
 
-    async def _polling(self, timeout: Union[int, float] = 2) -> None:
+        if self.__batcher is not None:
+            self.__batcher.cancel()
+        for handler in self.__avl_event_handlers.values():
+            if handler.offload is not None:
+                # the worker processes don't outlive the client
+                handler.offload.close()
+        if self.__health_task is not None:
+            self.__health_task.cancel()
+            self.__health_task = None
+        if self.__session is not None:
+            session, self.__session = self.__session, None
+            if not session.closed:
+                await session.close()
+                logger.debug("Connection pool closed")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the shared client session, creates it on first usage"""
+
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(**self.__connector_params)
+            self.__session = aiohttp.ClientSession(
+                connector=connector,
+                trust_env=True,
+                trace_configs=[aiohttp_trace_config],
+                timeout=self._timeout
+            )
+            logger.debug("Connection pool opened")
+        if (self.__endpoints is not None and self.__endpoints.check_interval
+                and (self.__health_task is None or self.__health_task.done())):
+            self.__health_task = asyncio.create_task(self._check_endpoints())
+        return self.__session
+
+    async def _check_endpoints(self) -> None:
+        """Periodically checks the failed hosts to return them to the selection earlier"""
+
+        endpoints = self.__endpoints
+        while True:
+            await asyncio.sleep(endpoints.check_interval)
+            for endpoint in endpoints.failed():
+                started = time.monotonic()
+                try:
+                    async with self._get_session().get(
+                            urljoin(endpoint.url, self.__api_path),
+                            timeout=aiohttp.ClientTimeout(total=self._timeout.total)
+                    ) as response:
+                        healthy = response.status < 500
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    healthy = False
+                if healthy:
+                    logger.info("Wialon host %s is available again", endpoint.url)
+                    endpoints.on_success(endpoint, time.monotonic() - started)
+                else:
+                    endpoints.on_failure(endpoint)
+
+    async def _polling(self, timeout: Union[int, float] = 2,
+                       cadence: Optional[PollingCadence] = None) -> None:
         """Internal avl event polling loop"""
 
+        async with self._events_dispatching():
+            try:
+                await self._polling_loop(timeout, cadence)
+            finally:
+                if self.__events_recorder is not None:
+                    await self.__events_recorder.close()
+
+    @asynccontextmanager
+    async def _events_dispatching(self) -> AsyncIterator[None]:
+        """Runs the events queue workers for its scope, ends the streams on exit"""
+
+        workers: List[asyncio.Task] = []
+        if self.__event_queue is not None:
+            workers = [asyncio.create_task(self._event_worker(self.__event_queue, i),
+                                           name=f"AvlEventWorker ({i})")
+                       for i in range(self.__event_queue.workers)]
+        try:
+            yield
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            # the streams end after their queued events
+            for queue, _, _ in self.__event_streams:
+                queue.close()
+
+    async def _dispatch_events(self, events: Sequence[AvlEvent]) -> None:
+        """Passes the events to the handlers and the streams"""
+
+        if self.__item_store is not None:
+            # the handlers see the items already updated
+            for event in events:
+                self.__item_store.apply(event)
+        if self.__event_queue is not None:
+            # waits for the free slots if handlers fall behind
+            for event in events:
+                await self.__event_queue.put(event)
+        else:
+            await asyncio.gather(*[self._process_event_handlers(event)
+                                   for event in events])
+        if self.__event_streams:
+            await self._publish_events(events)
+
+    async def _polling_loop(self, timeout: Union[int, float],
+                            cadence: Optional[PollingCadence]) -> None:
         while self._sid:
+            sid = self._sid
+            events: Sequence[AvlEvent] = ()
             try:
+                if cadence is not None:
+                    cadence.on_poll()
                 response = await self.avl_evts()
-                events = AvlEvent.parse_avl_events_response(response)
-                await asyncio.gather(*[self._process_event_handlers(event) for event in events])
-            except WialonRequestLimitExceededError as err:
+                if self.__events_recorder is not None:
+                    await self._record_events(response)
+                events = AvlEventBatch(response)
+                await self._dispatch_events(events)
+            except (WialonRequestLimitExceededError, WialonReachedConcurrentRequestLimit) as err:
+                # the adaptive rate limiter, if used, already slowed down on this error
                 logger.exception(err)
-            await asyncio.sleep(timeout)
+            except aiohttp.ClientError as err:
+                # the next request goes to the other host
+                if self.__endpoints is None:
+                    raise
+                logger.exception(err)
+            except (WialonInvalidSession, WialonSessionExpiredOrIPChangedError) as err:
+                if not self.__auto_relogin:
+                    raise
+                logger.warning("Polling session lost: %r", err)
+                await self._reopen_session(sid)
+            await asyncio.sleep(timeout if cadence is None else cadence.next_delay(len(events)))
+
+    async def _record_events(self, response: Dict[str, Any]) -> None:
+        """Tees the raw response to the recorder"""
+
+        try:
+            await self.__events_recorder.record(response)  # type: ignore[union-attr]
+        except OSError as err:
+            # the failed recording doesn't stop polling
+            logger.exception(err)
+
+    async def replay_events(self, replay: EventsReplay) -> int:
+        """
+        Passes the recorded events to the handlers and the streams as if they were polled,
+        waits for the handlers to complete, returns the number of replayed events.
+        Can't be used while polling
+
+        >>> started = time.monotonic()
+        >>> count = await wialon.replay_events(EventsReplay('avl_evts.jsonl.gz', speed=None))
+        >>> print(count / (time.monotonic() - started), 'events per second')
+        """
+
+        if self.__polling_lock.locked():
+            raise RuntimeError("Can't replay the events while polling")
+        replayed = 0
+        async with self.__polling_lock:
+            async with self._events_dispatching():
+                async for response in replay:
+                    events = AvlEventBatch(response)
+                    await self._dispatch_events(events)
+                    replayed += len(events)
+                if self.__event_queue is not None:
+                    await self.__event_queue.join()
+                await asyncio.gather(*[handler.join()
+                                       for handler in self.__avl_event_handlers.values()])
+        return replayed
 
     async def avl_evts(self) -> Any:
         """Call avl_event request"""
@@ -306,125 +942,484 @@ class Wialon:
         if self.__polling_task:
             warnings.warn("Polling running, don't recommended to call 'avl_evts' manually",
                           WialonWarning)
-        url = urljoin(self.__base_url, 'avl_evts')
         params = {
             'sid': self._sid
         }
-        return await self.request('avl_evts', url, params)
+        return await self.request('avl_evts', 'avl_evts', params,
+                                  priority=RequestPriority.REALTIME)
 
     # pylint: disable=unused-argument
     async def call(self, action_name: str, *args: Any, **params: Any) -> Any:
         """Call the API method provided with the parameters supplied."""
 
-        params = convention.prepare_action_params(params)
-        payload = json.dumps(params, ensure_ascii=False)
-        params = {
-            'svc': convention.prepare_action_name(action_name),
-            'params': payload,
-            'sid': self._sid
-        }
-        return await self.request(action_name, self.__base_api_url, params)
-
-    async def batch(self, *calls: Coroutine[Any, Any, Any],
-                    flags_: flags.BatchFlag = flags.BatchFlag.EXECUTE_ALL) -> List[Any]:
-        """Adapter method for list of 'Wialon.call()',
-         coroutines to collect them to single batch API Call"""
-
-        actions = []
-        for coroutine in calls:
-            if not self._is_call(coroutine) or not coroutine.cr_frame:
-                raise TypeError("Coroutine is not an 'Wialon.call' instance")
-            coroutine_locals = coroutine.cr_frame.f_locals
-            actions.append({
-                'svc': convention.prepare_action_name(coroutine_locals['action_name']),
-                'params': coroutine_locals['params']
-            })
-            coroutine.close()
-        return await self.core_batch(params=actions, flags=flags_)
-
-    async def multipart(self, call: Coroutine[Any, Any, Any],
+        return await self.execute(WialonCall(action_name, params))
+
+    async def execute(self, call: WialonCall) -> Any:
+        """Execute the deferred WialonCall with its timeout and priority options"""
+
+        if call.timeout is None and call.priority is None:
+            return await self._execute(call)
+        with request_timeout(call.timeout):
+            if call.priority is None:
+                return await self._execute(call)
+            with request_priority(call.priority):
+                return await self._execute(call)
+
+    async def _execute(self, call: WialonCall) -> Any:
+        """Looks up the call in the cache, coalesces it with identical ones and sends"""
+
+        action_name = call.action_name
+        cached = self.__cache is not None and self.__cache.is_cached(action_name)
+        # the shared call runs in a separate task, so it can't pass the exclusive lock
+        coalesced = (self.__single_flight is not None
+                     and action_name in self.__single_flight_actions
+                     and not self.__exclusive_session_lock.locked())
+        if not cached and not coalesced:
+            return await self._dispatch_call(call)
+
+        key = convention.params_key(call.params)
+        user_id = self.__user_id
+        if cached:
+            hit, result = self.__cache.get(action_name, key, user_id)
+            if hit:
+                return result
+        if coalesced:
+            result = await self.__single_flight.do(
+                (action_name, key, self._sid), lambda: self._dispatch_call(call)
+            )
+        else:
+            result = await self._dispatch_call(call)
+        if cached:
+            self.__cache.set(action_name, key, result, user_id)
+        return result
+
+    async def _dispatch_call(self, call: WialonCall) -> Any:
+        """
+        Sends the call, retries it on transient failures,
+        replays it once with the new session if the session is lost
+        """
+
+        sid = self._sid
+        try:
+            result = await self._send_with_retry(call)
+        except (WialonInvalidSession, WialonSessionExpiredOrIPChangedError) as err:
+            if (not self.__auto_relogin or sid is None or _reopening_session.get()
+                    or call.action_name in self.SESSION_CONTROL_ACTIONS):
+                raise
+            if err.sid is not None and err.sid != sid:
+                # the additional session of the pool is lost, the primary one is still valid
+                await self._replace_pool_session(err.sid)
+            elif not await self._reopen_session(sid):
+                raise
+            logger.info("Replaying '%s' with the new session", call.action_name)
+            result = await self._send_with_retry(call)
+        if self.__auto_relogin or self.__endpoints is not None:
+            # the session can be reopened by the relogin or by the host switch
+            self._track_subscriptions(call)
+        if self.__item_store is not None:
+            self._seed_item_store(call, result)
+        return result
+
+    async def _send_with_retry(self, call: WialonCall) -> Any:
+        """Sends the call, retries it on transient failures"""
+
+        if self.__retry is not None:
+            # the policy deadline is limited by the deadline of the caller scope
+            return await self.__retry.call(call.action_name, lambda: self._send_call(call))
+        return await self._send_call(call)
+
+    def _track_subscriptions(self, call: WialonCall) -> None:
+        """Remembers 'core/update_data_flags' params to restore them in the new session"""
+
+        if call.action_name == 'core_update_data_flags':
+            specs = [call.params]
+        elif call.action_name == 'core_batch' and isinstance(call.params.get('params'), list):
+            specs = [action['params'] for action in call.params['params']
+                     if action.get('svc') == 'core/update_data_flags']
+        else:
+            return
+        for params in specs:
+            key = convention.params_key(params)
+            # the latest subscriptions are applied last
+            self.__subscriptions.pop(key, None)
+            self.__subscriptions[key] = params
+
+    def _seed_item_store(self, call: WialonCall, result: Any) -> None:
+        """Puts the items of 'core/update_data_flags' response to the item store"""
+
+        if call.action_name == 'core_update_data_flags':
+            self.__item_store.seed(result)  # type: ignore[union-attr]
+        elif (call.action_name == 'core_batch' and isinstance(result, list)
+              and isinstance(call.params.get('params'), list)):
+            for action, action_result in zip(call.params['params'], result):
+                if action.get('svc') == 'core/update_data_flags':
+                    self.__item_store.seed(action_result)  # type: ignore[union-attr]
+
+    async def _restore_subscriptions(self) -> None:
+        """Applies the remembered 'core/update_data_flags' calls to the new session"""
+
+        if not self.__subscriptions:
+            return
+        logger.info("Restoring %d data flags subscriptions", len(self.__subscriptions))
+        await self.batch(*[WialonCall('core_update_data_flags', params, prepared=True)
+                           for params in list(self.__subscriptions.values())],
+                         flags_=flags.BatchFlag.STOP_ON_ERROR)
+
+    async def _send_call(self, call: WialonCall) -> Any:
+        """Sends the call directly or with automatic batch"""
+
+        if self._is_batchable(call.action_name):
+            return await self.__batcher.submit(call)
+        with self._session_for(call) as sid:
+            return await self.request(call.action_name, self.__api_path, call.payload(sid))
+
+    @contextmanager
+    def _session_for(self, call: WialonCall) -> Iterator[Optional[str]]:
+        """Chooses the session for the call, the session errors keep the session id"""
+
+        with self._choose_session(call) as sid:
+            try:
+                yield sid
+            except (WialonInvalidSession, WialonSessionExpiredOrIPChangedError) as err:
+                if err.sid is None:
+                    err.sid = sid
+                raise
+
+    def _choose_session(self, call: WialonCall) -> ContextManager[Optional[str]]:
+        """Chooses the session of the pool for the call"""
+
+        if self.__sessions is None or self.__sessions.primary != self._sid:
+            return nullcontext(self._sid)
+        # the exclusive operations usually keep the state in the session
+        primary = self.__exclusive_session_lock.locked()
+        if call.action_name == 'core_batch':
+            actions = call.params.get('params')
+            if isinstance(actions, list):
+                primary = primary or any(
+                    action.get('svc') in self.__primary_svcs for action in actions
+                )
+        else:
+            primary = primary or call.action_name in self.PRIMARY_SESSION_ACTIONS
+        item_id = call.params.get('itemId', call.params.get('id'))
+        return self.__sessions.session(item_id if isinstance(item_id, int) else None, primary)
+
+    def _is_batchable(self, action_name: str) -> bool:
+        """Checks if call can be collected to automatic batch"""
+
+        if self.__batcher is None or action_name in self.NON_BATCHABLE_ACTIONS:
+            return False
+        # the batch is sent with the default timeout, priority and any session of the pool
+        if (has_custom_timeout() or current_affinity.get() is not None
+                or current_priority.get() != RequestPriority.INTERACTIVE):
+            return False
+        # the batch is sent from a separate task, so it can't pass the exclusive lock
+        return not self.__exclusive_session_lock.locked()
+
+    async def _send_auto_batch(self, calls: List[WialonCall]) -> List[Any]:
+        """
+        Sends the calls collected by automatic batching as a single 'core/batch' request,
+        returns the results or WialonError instances in the order of calls
+        """
+
+        if len(calls) == 1:
+            call = calls[0]
+            try:
+                with self._session_for(call) as sid:
+                    return [await self.request(call.action_name, self.__api_path,
+                                               call.payload(sid))]
+            except WialonError as err:
+                return [err]
+
+        batch_call = WialonCall('core_batch', {
+            'params': [call.batch_action() for call in calls],
+            'flags': flags.BatchFlag.EXECUTE_ALL
+        }, prepared=True)
+        try:
+            with self._session_for(batch_call) as sid:
+                results = await self.request('core_batch', self.__api_path,
+                                             batch_call.payload(sid))
+        except WialonError as err:
+            # per-call errors are collected to the single exception by validator
+            if not isinstance(err.result, list):
+                raise
+            results = err.result
+
+        if not isinstance(results, list) or len(results) != len(calls):
+            raise WialonInvalidResult("Unexpected automatic batch response", 'core_batch', results)
+
+        demuxed: List[Any] = []
+        for call, result in zip(calls, results):
+            try:
+                await WialonCallRespValidator.validate_result(call.action_name, result)
+                demuxed.append(result)
+            except WialonError as err:
+                demuxed.append(err)
+        return demuxed
+
+    async def batch(self, *calls: Union[WialonCall, Coroutine[Any, Any, Any]],
+                    flags_: flags.BatchFlag = flags.BatchFlag.EXECUTE_ALL,
+                    chunk_size: Optional[int] = None,
+                    chunk_bytes: Optional[int] = None) -> List[Any]:
+        """
+        Adapter method for list of WialonCall objects or 'Wialon.call()' coroutines
+        to collect them to single batch API Call.
+        If the chunk limits are set, oversized batch is split to the chunks sent concurrently,
+        the results are returned in the original order.
+        With BatchFlag.STOP_ON_ERROR or under the session lock chunks are sent one by one,
+        with BatchFlag.STOP_ON_ERROR no more chunks are sent after the failed one
+        :param chunk_size: Max calls per request, defaults to Wialon.BATCH_CHUNK_SIZE
+        :param chunk_bytes: Max calls params size in bytes per request,
+                            defaults to Wialon.BATCH_CHUNK_BYTES
+        """
+
+        actions = [self._as_wialon_call(call).batch_action() for call in calls]
+
+        chunk_size = chunk_size or self.BATCH_CHUNK_SIZE
+        chunk_bytes = chunk_bytes or self.BATCH_CHUNK_BYTES
+        if chunk_size is None and chunk_bytes is None:
+            return await self._send_batch(actions, flags_)
+        chunks = split_batch(actions, chunk_size or len(actions) or 1,
+                             chunk_bytes or sys.maxsize)
+        if len(chunks) <= 1:
+            return await self._send_batch(actions, flags_)
+
+        logger.debug("Batch of %d calls split to %d chunks", len(actions), len(chunks))
+        results: List[Any] = []
+        stop_on_error = bool(flags_ & flags.BatchFlag.STOP_ON_ERROR)
+        # the chunks sent from separate tasks can't pass the exclusive lock
+        if stop_on_error or self.__exclusive_session_lock.locked():
+            for chunk in chunks:
+                chunk_results, failed = await self._send_batch_chunk(chunk, flags_)
+                results.extend(chunk_results)
+                if failed and stop_on_error:
+                    break
+        else:
+            for chunk_results, _ in await asyncio.gather(
+                    *[self._send_batch_chunk(chunk, flags_) for chunk in chunks]
+            ):
+                results.extend(chunk_results)
+        # raises the errors of all the chunks with their indexes in the whole batch
+        await WialonCallRespValidator.validate_result('core_batch', results)
+        return results
+
+    async def _send_batch(self, actions: List[Dict[str, Any]],
+                          flags_: flags.BatchFlag) -> List[Any]:
+        """Sends the prepared actions as a single 'core/batch' call"""
+
+        return await self.execute(
+            WialonCall('core_batch', {'params': actions, 'flags': flags_}, prepared=True)
+        )
+
+    async def _send_batch_chunk(self, actions: List[Dict[str, Any]],
+                                flags_: flags.BatchFlag) -> Tuple[List[Any], bool]:
+        """Sends the chunk of batch, returns its results and if any call failed"""
+
+        try:
+            return await self._send_batch(actions, flags_), False
+        except WialonError as err:
+            if not isinstance(err.result, list):
+                raise
+            return err.result, True
+
+    async def multipart(self, call: Union[WialonCall, Coroutine[Any, Any, Any]],
                         *fields: MultipartField) -> Any:
-        """Adapter method for 'Wialon.call()' coroutine
+        """Adapter method for WialonCall or 'Wialon.call()' coroutine
          to send multipart data to server"""
 
-        if not self._is_call(call) or not call.cr_frame:
-            raise TypeError("Coroutine is not an Wialon.call")
+        call = self._as_wialon_call(call)
+        with self._session_for(call) as sid:
+            form_data = aiohttp.FormData(call.payload(sid))
+            for f in fields:
+                form_data.add_field(**f.dict())
+            return await self.request(call.action_name, self.__api_path, payload=form_data)
+
+    @classmethod
+    def _as_wialon_call(cls, call: Union[WialonCall, Coroutine[Any, Any, Any]]) -> WialonCall:
+        """
+        Returns WialonCall as is,
+        converts not started 'Wialon.call()' coroutine to the WialonCall and closes it
+        """
+
+        if isinstance(call, WialonCall):
+            return call
+        if not cls._is_call(call) or not call.cr_frame:
+            raise TypeError("Coroutine is not an 'Wialon.call' instance")
         coroutine_locals = call.cr_frame.f_locals
-        action_name = coroutine_locals['action_name']
-        params = coroutine_locals['params']
+        wialon_call = WialonCall(coroutine_locals['action_name'], coroutine_locals['params'])
         call.close()
-        form_data = aiohttp.FormData(
-            {
-                'sid': self._sid,
-                'svc': convention.prepare_action_name(action_name),
-                'params': json.dumps(params)
-            }
-        )
-        for f in fields:
-            form_data.add_field(**f.dict())
-        return await self.request(action_name, self.__base_api_url, payload=form_data)
+        return wialon_call
 
     @classmethod
     def _is_call(cls, coroutine: Coroutine[Any, Any, Any]) -> bool:
         """Internally check if coroutine is the 'Wialon.call()' method"""
 
-        if coroutine.__qualname__ == cls.call.__qualname__:
+        if getattr(coroutine, '__qualname__', None) == cls.call.__qualname__:
             return True
         return False
 
     def __getattr__(self, action_name: str):
         """
         Enable the calling of Wialon API methods through Python method calls
-        of the same name.
+        of the same name. The registered actions are the class methods,
+        so this is the fallback for the actions missing in the registry
         """
 
-        def get(_self, *args, **kwargs):
-            return self.call(action_name, *args, **kwargs)
-
-        return get.__get__(self, object)
-
-    async def request(self, action_name: str, url: str, payload: Any) -> Any:
+        if action_name.startswith('_'):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{action_name}'"
+            )
+        if self.__strict_actions:
+            message = f"Unknown Wialon Remote API action '{action_name}'"
+            suggestions = difflib.get_close_matches(action_name, WIALON_ACTIONS, n=1)
+            if suggestions:
+                message += f", did you mean '{suggestions[0]}'?"
+            raise AttributeError(message)
+        return _api_method(action_name).__get__(self, type(self))
+
+    async def request(self, action_name: str, url: str, payload: Any,
+                      priority: Optional[RequestPriority] = None) -> Any:
         """
         Base request method for Wialon API Client
         Can be used to perform direct requests for not declared methods,
         but not recommended
+        :param url: Absolute url or path relative to the Wialon host, e.g. 'wialon/ajax.html'
+        :param priority: Request priority class, defaults to the one set
+                         with 'Wialon.request_priority' or INTERACTIVE
         """
 
         await self.__exclusive_session_lock.wait()
 
         if not action_name:
             action_name = "undefined_action"
-        async with self.__limiter:
-            async with self.__semaphore:
-                async with aiohttp.ClientSession(
-                        trust_env=True,
-                        trace_configs=[aiohttp_trace_config],
-                        timeout=self._timeout) as session:
-                    try:
-                        async with session.post(url=url, data=payload) as response:
-                            # response.raise_for_status()
-                            await WialonCallRespValidator.validate_headers(response)
-
-                            if await WialonCallRespValidator.has_attachment(response):
-                                return await response.content.read()
-
-                            response_data = await response.read()
-                            result = json.loads(response_data)
-                            await WialonCallRespValidator.validate_result(action_name, result)
-                            return result
-                    except (aiohttp.ClientError, WialonError) as e:
-                        logger.exception(e)
-                        raise
+        # the scheduler decides who takes the next rate limiter slot
+        await self.__scheduler.acquire(priority)
+        try:
+            await self.__limiter.acquire()
+        finally:
+            self.__scheduler.release()
+        if self.__endpoints is None:
+            return await self._post(action_name, urljoin(self.__base_url, url), payload)
+        return await self._post_with_failover(action_name, url, payload)
+
+    async def _post_with_failover(self, action_name: str, url: str, payload: Any) -> Any:
+        """
+        Sends the request to the host chosen by the endpoints pool,
+        resends it to the next host if it's safe, reopens the session if the host is switched
+        """
+
+        endpoints = self.__endpoints
+        sid = self._sid
+        attempt = 1
+        while True:
+            endpoint = endpoints.select()
+            started = time.monotonic()
+            try:
+                result = await self._post(action_name, urljoin(endpoint.url, url), payload)
+            except (aiohttp.ClientConnectionError, aiohttp.ClientResponseError) as err:
+                if isinstance(err, aiohttp.ClientResponseError) and err.status < 500:
+                    raise
+                switched = endpoints.on_failure(endpoint)
+                if switched and sid and action_name not in self.SESSION_CONTROL_ACTIONS:
+                    # the session of the failed host is not valid on the new one,
+                    # the reopening in progress holds the relogin lock and fails on its own
+                    if not _reopening_session.get():
+                        await self._reopen_session(sid)
+                    raise
+                if not (switched or endpoints.shared_sessions):
+                    raise
+                if attempt >= len(endpoints.endpoints):
+                    raise
+                if not self._can_resend(action_name, payload, err):
+                    raise
+                logger.warning("Resending '%s' to the next Wialon host: %r", action_name, err)
+                attempt += 1
+                continue
+            endpoints.on_success(endpoint, time.monotonic() - started)
+            return result
+
+    def _can_resend(self, action_name: str, payload: Any, err: Exception) -> bool:
+        """Checks if the failed request can be sent to the other host"""
+
+        if isinstance(payload, aiohttp.FormData):
+            return False
+        # the request wasn't sent at all
+        if isinstance(err, aiohttp.ClientConnectorError):
+            return True
+        return action_name in self.READ_ONLY_ACTIONS or action_name == 'avl_evts'
+
+    async def _reopen_session(self, sid: str) -> bool:
+        """
+        Opens the new session with login params of the lost one, once for concurrent callers,
+        returns True if the session is reopened
+        """
+
+        async with self.__relogin_lock:
+            if self._sid != sid:
+                # already reopened by the concurrent caller
+                return self._sid is not None
+            if self.__login_params is None:
+                return False
+            # don't repeat the failed login for each of the concurrent callers
+            if (self.__relogin_failed is not None and self.__relogin_failed[0] == sid
+                    and time.monotonic() - self.__relogin_failed[1] < self._timeout.total):
+                return False
+            logger.warning("Reopening Wialon session")
+            token = _reopening_session.set(True)
+            try:
+                await self.login(**self.__login_params)
+                self.__relogin_failed = None
+                await self._restore_subscriptions()
+            except (WialonError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if self._sid == sid:
+                    self.__relogin_failed = (sid, time.monotonic())
+                    logger.error("Can't reopen Wialon session: %r", err)
+                    return False
+                logger.error("Wialon session reopened with errors: %r", err)
+            finally:
+                _reopening_session.reset(token)
+            return True
+
+    async def _post(self, action_name: str, url: str, payload: Any) -> Any:
+        """Sends the request within the requests in flight limit"""
+
+        async with self.__concurrency:
+            session = self._get_session()
+            timeout = aiohttp.ClientTimeout(total=effective_timeout(self._timeout.total))
+            started = time.monotonic()
+            try:
+                async with session.post(url=url, data=payload,
+                                        timeout=timeout) as response:
+                    if response.status >= 500:
+                        response.raise_for_status()
+                    await WialonCallRespValidator.validate_headers(response)
+
+                    if await WialonCallRespValidator.has_attachment(response):
+                        result = await response.content.read()
+                    else:
+                        response_data = await response.read()
+                        result = json.loads(response_data)
+                        await WialonCallRespValidator.validate_result(action_name, result)
+            except (aiohttp.ClientError, WialonError) as e:
+                if is_throttling_error(e):
+                    if isinstance(self.__limiter, AdaptiveRateLimiter):
+                        self.__limiter.on_throttled()
+                    self.__concurrency.on_sample(time.monotonic() - started, dropped=True)
+                logger.exception(e)
+                raise
+            latency = time.monotonic() - started
+            if isinstance(self.__limiter, AdaptiveRateLimiter):
+                self.__limiter.on_success(latency)
+            self.__concurrency.on_sample(latency)
+            return result
 
     async def wait(self, call: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
-        """Decorate a Call with specified request timeout"""
-        prev_timeout = self.timeout
-        if timeout:
-            self.timeout = timeout
-        try:
+        """
+        Decorate a Call with specified request timeout,
+        doesn't affect the timeout of concurrent calls
+        """
+
+        with self.request_timeout(timeout):
             return await call
-        finally:
-            self.timeout = prev_timeout
 
     @staticmethod
     def help(service_name: str, action_name: str) -> None:
@@ -443,4 +1438,22 @@ class Wialon:
             logger.info("Cannot open webbrowser: %s", url)
 
 
+@lru_cache(maxsize=512)
+def _api_method(action_name: str) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """Builds the Wialon.<action_name> method, that returns the 'Wialon.call()' coroutine"""
+
+    def method(self: Wialon, *args: Any, **params: Any) -> Coroutine[Any, Any, Any]:
+        return self.call(action_name, *args, **params)
+
+    method.__name__ = action_name
+    method.__qualname__ = f"{Wialon.__qualname__}.{action_name}"
+    method.__doc__ = (f"Calls '{convention.prepare_action_name(action_name)}' "
+                      f"Wialon Remote API action")
+    return method
+
+
+for _action_name in WIALON_ACTIONS:
+    if not hasattr(Wialon, _action_name):
+        setattr(Wialon, _action_name, _api_method(_action_name))
+
 __all__ = ['Wialon']
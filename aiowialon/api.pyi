@@ -1,11 +1,31 @@
-from aiowialon.types import AvlEventCallback, AvlEventFilter, LoginCallback, LoginParams, LogoutCallback, MultipartField, flags
+from aiowialon.types import AvlEvent, AvlEventCallback, AvlEventFilter, AvlEventSpec, LoginCallback, LoginParams, LogoutCallback, MultipartField, WialonCall, flags
+from aiowialon.utils.cache import ResponseCache
 from aiowialon.utils.compat import Unpack
-from typing import Any, Callable, Coroutine, Literal
+from aiowialon.utils.concurrency import ConcurrencyLimiter
+from aiowialon.utils.endpoints import EndpointPool
+from aiowialon.utils.events import EventQueue
+from aiowialon.utils.limiter import AdaptiveRateLimiter
+from aiowialon.utils.offload import ProcessOffload
+from aiowialon.utils.polling import PollingCadence
+from aiowialon.utils.recording import EventsRecorder, EventsReplay
+from aiowialon.utils.retry import RetryPolicy
+from aiowialon.utils.scheduler import PriorityScheduler, RequestPriority
+from aiowialon.utils.sessions import SessionPool
+from aiowialon.utils.store import ItemStore
+from typing import Any, AsyncIterator, Callable, ContextManager, Coroutine, Iterable, Literal
 
 __all__ = ['Wialon']
 
 class Wialon:
-    def __init__(self, scheme: Literal['https', 'http'] = 'https', host: str = 'hst-api.wialon.com', port: int | None = None, token: str | None = None, rps: int = 10) -> None: ...
+    NON_BATCHABLE_ACTIONS: frozenset[str]
+    PRIMARY_SESSION_ACTIONS: frozenset[str]
+    SESSION_CONTROL_ACTIONS: frozenset[str]
+    BATCH_CHUNK_SIZE: int | None
+    BATCH_CHUNK_BYTES: int | None
+    READ_ONLY_ACTIONS: frozenset[str]
+    def __init__(self, scheme: Literal['https', 'http'] = 'https', host: str = 'hst-api.wialon.com', port: int | None = None, token: str | None = None, rps: int = 10, *, limit_per_host: int = 10, keepalive_timeout: float = 30, ttl_dns_cache: int | None = 300, auto_batch: bool = False, auto_batch_delay: float = 0.05, auto_batch_size: int = 50, single_flight: bool = False, single_flight_actions: Iterable[str] | None = None, cache: ResponseCache | None = None, rate_limiter: AdaptiveRateLimiter | None = None, priority_weights: dict[RequestPriority, int] | None = None, retry: RetryPolicy | None = None, max_concurrency: int = 10, concurrency_limiter: ConcurrencyLimiter | None = None, strict_actions: bool = False, sessions: SessionPool | None = None, endpoints: EndpointPool | None = None, auto_relogin: bool = False, event_queue: EventQueue | None = None, events_recorder: EventsRecorder | None = None, item_store: ItemStore | None = None) -> None: ...
+    async def __aenter__(self) -> Wialon: ...
+    async def __aexit__(self, *exc_info: Any) -> None: ...
     @property
     def token(self) -> str | None: ...
     @token.setter
@@ -15,22 +35,52 @@ class Wialon:
     @timeout.setter
     def timeout(self, timeout: float) -> None: ...
     @property
+    def rate_limiter(self) -> AdaptiveRateLimiter | None: ...
+    @property
+    def concurrency_limiter(self) -> ConcurrencyLimiter: ...
+    @property
+    def scheduler(self) -> PriorityScheduler: ...
+    @staticmethod
+    def request_priority(priority: RequestPriority) -> ContextManager[None]: ...
+    @property
+    def retry(self) -> RetryPolicy | None: ...
+    @staticmethod
+    def request_timeout(timeout: float | None = None, deadline: float | None = None) -> ContextManager[None]: ...
+    @property
+    def cache(self) -> ResponseCache | None: ...
+    @property
+    def sessions(self) -> SessionPool | None: ...
+    @property
+    def event_queue(self) -> EventQueue | None: ...
+    @property
+    def item_store(self) -> ItemStore | None: ...
+    @property
+    def endpoints(self) -> EndpointPool | None: ...
+    @staticmethod
+    def session_affinity() -> ContextManager[None]: ...
+    @property
     def session_lock(self) -> Callable: ...
     def on_session_open(self, callback: LoginCallback | None = None) -> LoginCallback | None: ...
     def on_session_close(self, callback: LogoutCallback | None = None) -> LogoutCallback | None: ...
-    def avl_event_handler(self, filter_: AvlEventFilter | None = None) -> Callable: ...
+    def avl_event_handler(self, filter_: AvlEventFilter | None = None, max_concurrency: int | None = None, spec: AvlEventSpec | None = None, offload: ProcessOffload | None = None) -> Callable: ...
     def avl_event_once(self, func: Callable[..., Coroutine[Any, Any, Any]] | None = None) -> Callable[..., Coroutine[Any, Any, Any]]: ...
     def remove_avl_event_handler(self, callback: str | AvlEventCallback): ...
-    async def start_polling(self, timeout: int | float = 2, logout_finally: bool = True, **params: Unpack[LoginParams]) -> None: ...
+    def events(self, batch_size: int = 100, filter_: AvlEventFilter | None = None, spec: AvlEventSpec | None = None, queue: EventQueue | None = None) -> AsyncIterator[list[AvlEvent]]: ...
+    def event_stream(self, filter_: AvlEventFilter | None = None, spec: AvlEventSpec | None = None, queue: EventQueue | None = None) -> AsyncIterator[AvlEvent]: ...
+    async def replay_events(self, replay: EventsReplay) -> int: ...
+    async def start_polling(self, timeout: int | float = 2, logout_finally: bool = True, cadence: PollingCadence | None = None, **params: Unpack[LoginParams]) -> None: ...
     async def stop_polling(self, logout: bool = False) -> None: ...
     async def login(self, **params: Unpack[LoginParams]) -> dict[str, Any]: ...
     async def logout(self) -> Any: ...
+    async def close(self) -> None: ...
     async def avl_evts(self) -> Any: ...
     async def call(self, action_name: str, *args: Any, **params: Any) -> Any: ...
-    async def batch(self, *calls: Coroutine[Any, Any, Any], flags_: flags.BatchFlag = ...) -> list[Any]: ...
-    async def multipart(self, call: Coroutine[Any, Any, Any], *fields: MultipartField) -> Any: ...
+    async def execute(self, call: WialonCall) -> Any: ...
+    async def batch(self, *calls: WialonCall | Coroutine[Any, Any, Any], flags_: flags.BatchFlag = ..., chunk_size: int | None = None, chunk_bytes: int | None = None) -> list[Any]: ...
+    async def multipart(self, call: WialonCall | Coroutine[Any, Any, Any], *fields: MultipartField) -> Any: ...
     def __getattr__(self, action_name: str): ...
-    async def request(self, action_name: str, url: str, payload: Any) -> Any: ...
+    async def request(self, action_name: str, url: str, payload: Any, priority: RequestPriority | None = None) -> Any: ...
+    async def wait(self, call: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any: ...
     @staticmethod
     def help(service_name: str, action_name: str) -> None: ...
 
@@ -41,6 +41,9 @@ class WialonError(Exception):
               'in another sensor or advanced properties of the unit',
     }
 
+    # session of the failed call, set for the session errors
+    sid: Optional[str] = None
+
     def __init__(self, code: int,
                  reason: Optional[WialonErrorReason] = None,
                  action_name: Optional[str] = None,
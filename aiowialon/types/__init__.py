@@ -7,4 +7,5 @@ and also for types annotations
 from .avl_events import *
 from .login import *
 from .multipart import *
+from .call import *
 from . import flags
@@ -1,14 +1,20 @@
 """Object-oriented model for handled AVL-events"""
 
 import asyncio
+import heapq
+import itertools
+from collections.abc import Sequence
 from contextlib import suppress
-from dataclasses import dataclass, field
-from typing import Optional, Callable, Coroutine, Dict, Any, List, Union
+from dataclasses import dataclass
+from typing import (Optional, Callable, Coroutine, Dict, Any, List, Union,
+                    FrozenSet, Iterable, Iterator, Set, Tuple)
 
 import aiohttp
 
 from aiowialon.exceptions import WialonError
 from aiowialon.logger import logger
+from aiowialon.utils.concurrency import ConcurrencyLimiter
+from aiowialon.utils.offload import ProcessOffload
 from aiowialon.utils.compat import StrEnum
 
 
@@ -20,98 +26,263 @@ class AvlEventType(StrEnum):
     DELETE = "d"
 
 
-@dataclass(frozen=True)
+# interned event types by their raw values, the enum lookup is much slower than dict one
+_EVENT_TYPES: Dict[str, AvlEventType] = {t.value: t for t in AvlEventType}
+
+
+def _event_type(t: Any) -> AvlEventType:
+    if not isinstance(t, str):
+        raise TypeError(f"AvlEventData.t has be a type of {AvlEventType}")
+    event_type = _EVENT_TYPES.get(t)
+    return event_type if event_type is not None else AvlEventType(t)
+
+
+@dataclass(frozen=True, init=False)
 class AvlEventData:
     """Keeps AVL event data, qualified by item uid"""
 
+    __slots__ = ('i', 't', 'd')
+
     i: int
     t: AvlEventType
-    d: Dict[str, Any] = field(default_factory=dict)
+    d: Dict[str, Any]
 
-    def __post_init__(self):
-        if not isinstance(self.t, AvlEventType) and isinstance(self.t, str):
-            object.__setattr__(self, 't', AvlEventType(self.t))
-        else:
-            raise TypeError(f"AvlEventData.t has be a type of {AvlEventType}")
+    def __init__(self, i: int, t: Union[AvlEventType, str],
+                 d: Optional[Dict[str, Any]] = None) -> None:
+        _set_data_i(self, i)
+        _set_data_t(self, _event_type(t))
+        _set_data_d(self, {} if d is None else d)
 
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> 'AvlEventData':
+        """Decodes the event of 'avl_evts' response"""
 
-@dataclass(frozen=True)
+        data = object.__new__(cls)
+        _set_data_i(data, raw['i'])
+        _set_data_t(data, _event_type(raw['t']))
+        d = raw.get('d')
+        _set_data_d(data, {} if d is None else d)
+        return data
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # the frozen slots can't be restored with setattr
+        return AvlEventData, (self.i, self.t, self.d)
+
+
+# the slots are set directly, the frozen dataclass __setattr__ always raises
+_set_data_i = AvlEventData.__dict__['i'].__set__
+_set_data_t = AvlEventData.__dict__['t'].__set__
+_set_data_d = AvlEventData.__dict__['d'].__set__
+
+
+@dataclass(frozen=True, init=False)
 class AvlEvent:
     """
     AVL event dataclass represents the Object-oriented AVL-event,
-    used by AvlEventHandler
+    used by AvlEventHandler.
+    Keeps the raw event of 'avl_evts' response and decodes its data on the first access
     """
 
+    __slots__ = ('tm', 'data', '_raw')
+
     tm: Union[int, None]
     data: AvlEventData
 
-    # pylint: disable=not-a-mapping
-    def __post_init__(self):
-        if not isinstance(self.data, AvlEventData):
-            if isinstance(self.data, dict):
-                object.__setattr__(self, 'data', AvlEventData(**self.data))
-            else:
-                raise TypeError(f"AvlEvent.event has be a type of {AvlEventData}")
+    def __init__(self, tm: Union[int, None],
+                 data: Union[AvlEventData, Dict[str, Any]]) -> None:
+        _set_event_tm(self, tm)
+        if isinstance(data, dict):
+            # 'data' slot stays empty till the first access
+            _set_event_raw(self, data)
+        elif isinstance(data, AvlEventData):
+            _set_event_raw(self, None)
+            _set_event_data(self, data)
+        else:
+            raise TypeError(f"AvlEvent.event has be a type of {AvlEventData}")
+
+    def __getattr__(self, name: str) -> Any:
+        # called only while the 'data' slot is empty
+        if name != 'data':
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        data = AvlEventData.from_raw(self._raw)
+        _set_event_data(self, data)
+        return data
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return AvlEvent, (self.tm, self._raw if self._raw is not None else self.data)
 
     @staticmethod
     def parse_avl_events_response(avl_events: Dict[str, Any]) -> List['AvlEvent']:
         """AVL-events response parser"""
 
-        tm = avl_events.get('tm', None)
-        events = avl_events.get('events', [])
-        return [AvlEvent(tm, e) for e in events]
+        return list(AvlEventBatch(avl_events))
+
+
+_set_event_tm = AvlEvent.__dict__['tm'].__set__
+_set_event_data = AvlEvent.__dict__['data'].__set__
+_set_event_raw = AvlEvent.__dict__['_raw'].__set__
+
+
+class AvlEventBatch(Sequence):
+    """
+    Read-only view over the events of one 'avl_evts' response,
+    the AvlEvent objects are created on the first access and reused then
+    """
+
+    __slots__ = ('tm', '_raw', '_events')
+
+    def __init__(self, avl_events: Dict[str, Any]) -> None:
+        self.tm: Union[int, None] = avl_events.get('tm', None)
+        self._raw: List[Dict[str, Any]] = avl_events.get('events') or []
+        self._events: List[Optional[AvlEvent]] = [None] * len(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def _event(self, index: int) -> AvlEvent:
+        event = self._events[index]
+        if event is None:
+            event = self._events[index] = AvlEvent(self.tm, self._raw[index])
+        return event
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._event(i) for i in range(len(self._raw))[index]]
+        return self._event(range(len(self._raw))[index])
+
+    def __iter__(self) -> Iterator[AvlEvent]:
+        events, raw, tm = self._events, self._raw, self.tm
+        for index, event in enumerate(events):
+            if event is None:
+                event = events[index] = AvlEvent(tm, raw[index])
+            yield event
+
+    def items(self) -> Set[int]:
+        """Returns ids of the items having events in the batch"""
+
+        return {raw['i'] for raw in self._raw}
+
+    def __repr__(self) -> str:
+        return f"AvlEventBatch(tm={self.tm!r}, events={len(self._raw)})"
 
 
 AvlEventCallback = Callable[[AvlEvent], Coroutine]
+AvlEventResultCallback = Callable[[AvlEvent, Any], Coroutine]
 AvlEventFilter = Callable[[AvlEvent], bool]
 
 
+@dataclass(frozen=True)
+class AvlEventSpec:
+    """
+    Declarative AVL events filter, indexed by the events router,
+    so the handlers of the other items and event types are not checked at all.
+    None means any value
+    """
+
+    items: Optional[FrozenSet[int]] = None
+    types: Optional[FrozenSet[AvlEventType]] = None
+    message_types: Optional[FrozenSet[str]] = None  # message 'tp', e.g. 'ud', 'evt'
+    flags: int = 0  # message 'f' bits required to be set
+
+    def __post_init__(self):
+        if self.items is not None:
+            object.__setattr__(self, 'items', frozenset(self.items))
+        if self.types is not None:
+            object.__setattr__(self, 'types', frozenset(AvlEventType(t) for t in self.types))
+        if self.message_types is not None:
+            object.__setattr__(self, 'message_types', frozenset(self.message_types))
+
+    def matches(self, event: AvlEvent) -> bool:
+        """Checks if the event satisfies the filter"""
+
+        data = event.data
+        if self.items is not None and data.i not in self.items:
+            return False
+        if self.types is not None and data.t not in self.types:
+            return False
+        if self.message_types is None and not self.flags:
+            return True
+        if data.t != AvlEventType.MESSAGE:
+            return False
+        if self.message_types is not None and data.d.get('tp') not in self.message_types:
+            return False
+        return data.d.get('f', 0) & self.flags == self.flags
+
+
+# pylint: disable=too-many-instance-attributes
 class AvlEventHandler:
     """AvlEventHandler, using for handling AVL-events through registered callbacks"""
 
     def __init__(self,
                  callback: AvlEventCallback,
-                 filter_: Optional[AvlEventFilter] = None) -> None:
+                 filter_: Optional[AvlEventFilter] = None,
+                 max_concurrency: Optional[int] = None,
+                 spec: Optional[AvlEventSpec] = None,
+                 offload: Optional[ProcessOffload] = None) -> None:
+        """
+        :param max_concurrency: Max callback executions at the same time, unlimited if None
+        :param spec: Declarative filter checked before the filter function
+        :param offload: Processes the event in the worker process before the callback,
+                        the callback gets the event and the result
+        """
+
         self._callback: AvlEventCallback
         self._filter: Optional[AvlEventFilter]
+        self.spec: Optional[AvlEventSpec] = spec
+        self.offload: Optional[ProcessOffload] = offload
         self._tasks: List[asyncio.Task] = []
+        self._limiter: Optional[ConcurrencyLimiter] = (
+            ConcurrencyLimiter(max_concurrency) if max_concurrency is not None else None
+        )
 
         self.callback = callback
         self.filter = filter_
 
-    async def __call__(self, event: AvlEvent) -> bool:
+    async def __call__(self, event: AvlEvent, detached: bool = True) -> bool:
         """
         Makes an AvlEventHandler instance callable,
         calls the callback function with handled AvlEvent instance
         returns True if filter was applied and callback task executed
         and False otherwise
+        :param detached: Execute callback in a separate task, otherwise await it
         """
 
+        if self.spec is not None and not self.spec.matches(event):
+            return False
         if not self._filter:
-            await self.__process_event(event)
+            await self.__process_event(event, detached)
             return True
         if self._filter is not None:
             if self._filter(event):
-                await self.__process_event(event)
+                await self.__process_event(event, detached)
                 return True
         return False
 
-    async def __process_event(self, event: AvlEvent) -> None:
+    async def __process_event(self, event: AvlEvent, detached: bool = True) -> None:
         """
         Executes the callback function with handled AvlEvent,
         suppressing the exceptions if callback raises it to prevent app breaking.
         """
 
         logger.info("Got AVL event %s", event)
-        with suppress(asyncio.CancelledError):
-            # Wrap the callback with a try-except block to handle exceptions
-            async def wrapped_callback(event: AvlEvent):
-                try:
-                    await self._callback(event)
-                except (WialonError, aiohttp.ClientError) as e:
-                    logger.error("Exception happened in %s", self._callback.__name__)
-                    logger.exception(e)
 
+        # Wrap the callback with a try-except block to handle exceptions
+        async def wrapped_callback(event: AvlEvent):
+            try:
+                if self._limiter is None:
+                    await self.__invoke(event)
+                else:
+                    async with self._limiter:
+                        await self.__invoke(event)
+            except (WialonError, aiohttp.ClientError) as e:
+                logger.error("Exception happened in %s", self._callback.__name__)
+                logger.exception(e)
+
+        if not detached:
+            # the cancellation of the awaiting worker have to propagate
+            await wrapped_callback(event)
+            return
+        with suppress(asyncio.CancelledError):
             callback_task = asyncio.create_task(
                 wrapped_callback(event),
                 name=f"AvlEventHandler ({len(self._tasks)}): {self._callback.__name__}"
@@ -119,6 +290,20 @@ class AvlEventHandler:
             self._tasks.append(callback_task)
             callback_task.add_done_callback(self.__cleanup_task)
 
+    async def __invoke(self, event: AvlEvent) -> None:
+        if self.offload is None:
+            await self._callback(event)
+            return
+        try:
+            result = await self.offload.submit(event)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # the failed processing drops the event like the failed callback
+            logger.error("Offloaded processing failed in %s", self._callback.__name__)
+            logger.exception(e)
+            return
+        callback: AvlEventResultCallback = self._callback  # type: ignore[assignment]
+        await callback(event, result)
+
     def __cleanup_task(self, task: asyncio.Task):
         """Remove the task from the list once it's done"""
 
@@ -129,6 +314,12 @@ class AvlEventHandler:
             self._tasks.remove(task)
         logger.debug("Task completed and removed: %s", task.get_name())
 
+    async def join(self) -> None:
+        """Waits for the callback tasks in flight"""
+
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
     def cleanup(self):
         """cleaning the AvlEventHandler tasks"""
 
@@ -136,6 +327,9 @@ class AvlEventHandler:
                      self._callback.__name__)
         for task in self._tasks:
             self.__cleanup_task(task)
+        if self.offload is not None:
+            # the worker processes are restarted on the next event
+            self.offload.close()
         logger.debug("All handler tasks cancelled")
 
     @property
@@ -169,10 +363,76 @@ class AvlEventHandler:
         self._filter = filter_
 
 
+class AvlEventRouter:
+    """
+    Index of AVL event handlers by their declarative filters,
+    returns only the handlers which can match the event
+    in order of their registration
+    """
+
+    def __init__(self) -> None:
+        self._seq: Iterator[int] = itertools.count()
+        self._by_item: Dict[int, List[Tuple[int, AvlEventHandler]]] = {}
+        self._by_type: Dict[AvlEventType, List[Tuple[int, AvlEventHandler]]] = {}
+        self._wildcard: List[Tuple[int, AvlEventHandler]] = []
+        self._entries: Dict[AvlEventHandler, Tuple[int, AvlEventHandler]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _buckets(self, handler: AvlEventHandler) -> Iterable[List[Tuple[int, AvlEventHandler]]]:
+        spec = handler.spec
+        if spec is not None and spec.items is not None:
+            return [self._by_item.setdefault(i, []) for i in spec.items]
+        if spec is not None and spec.types is not None:
+            return [self._by_type.setdefault(t, []) for t in spec.types]
+        return [self._wildcard]
+
+    def add(self, handler: AvlEventHandler) -> None:
+        """Indexes the handler, it is checked after the ones added before"""
+
+        entry = (next(self._seq), handler)
+        self._entries[handler] = entry
+        for bucket in self._buckets(handler):
+            bucket.append(entry)
+
+    def remove(self, handler: AvlEventHandler) -> None:
+        """Removes the handler from the index"""
+
+        entry = self._entries.pop(handler, None)
+        if entry is None:
+            return
+        spec = handler.spec
+        for bucket in self._buckets(handler):
+            bucket.remove(entry)
+        # drop the empty buckets not to grow with the removed per-item handlers
+        if spec is not None and spec.items is not None:
+            for i in spec.items:
+                if not self._by_item[i]:
+                    del self._by_item[i]
+
+    def candidates(self, event: AvlEvent) -> Iterable[AvlEventHandler]:
+        """Returns the handlers to check for the event in order of their registration"""
+
+        buckets = [bucket for bucket in (self._by_item.get(event.data.i),
+                                         self._by_type.get(event.data.t),
+                                         self._wildcard) if bucket]
+        if not buckets:
+            return ()
+        if len(buckets) == 1:
+            return [handler for _, handler in buckets[0]]
+        return [handler for _, handler in heapq.merge(*buckets, key=lambda entry: entry[0])]
+
+
 __all__ = (
     'AvlEvent',
+    'AvlEventBatch',
     'AvlEventCallback',
+    'AvlEventResultCallback',
     'AvlEventFilter',
     'AvlEventData',
     'AvlEventHandler',
+    'AvlEventRouter',
+    'AvlEventSpec',
+    'AvlEventType',
 )
@@ -0,0 +1,64 @@
+"""Lightweight deferred Wialon Remote API call"""
+
+import json
+from typing import Any, Dict, Optional
+
+from aiowialon.utils import convention
+from aiowialon.utils.scheduler import RequestPriority
+
+
+class WialonCall:
+    """
+    Deferred Wialon Remote API call, keeps the action name,
+    the 'svc' name and the prepared params to be sent later with
+    'Wialon.execute', 'Wialon.batch' or 'Wialon.multipart'.
+    Cheaper than 'Wialon.call()' coroutine, cause it doesn't create coroutine frame
+    """
+
+    __slots__ = ('action_name', 'svc', 'params', 'timeout', 'priority')
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, action_name: str,
+                 params: Optional[Dict[str, Any]] = None, *,
+                 timeout: Optional[float] = None,
+                 priority: Optional[RequestPriority] = None,
+                 prepared: bool = False) -> None:
+        """
+        :param action_name: Call action name, e.g. 'core_search_item'
+        :param params: Call params, the same as keyword arguments of 'Wialon.call()'
+        :param timeout: Request timeout for this call,
+                        not applied if call is sent in a batch
+        :param priority: Request priority for this call,
+                         not applied if call is sent in a batch
+        :param prepared: Params are already in Wialon Remote API form
+        """
+
+        self.action_name: str = action_name
+        self.svc: str = convention.prepare_action_name(action_name)
+        if params is None:
+            params = {}
+        self.params: Dict[str, Any] = (
+            params if prepared else convention.prepare_action_params(params)
+        )
+        self.timeout: Optional[float] = timeout
+        self.priority: Optional[RequestPriority] = priority
+
+    def batch_action(self) -> Dict[str, Any]:
+        """Returns the call representation for the 'core/batch' params"""
+
+        return {'svc': self.svc, 'params': self.params}
+
+    def payload(self, sid: Optional[str]) -> Dict[str, Any]:
+        """Returns the request form data for the call"""
+
+        return {
+            'svc': self.svc,
+            'params': json.dumps(self.params, ensure_ascii=False),
+            'sid': sid
+        }
+
+    def __repr__(self) -> str:
+        return f"WialonCall({self.action_name!r}, {self.params!r})"
+
+
+__all__ = ['WialonCall']
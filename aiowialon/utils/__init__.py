@@ -3,3 +3,20 @@
 from .compat import *
 from .convention import *
 from .async_lock import *
+from .batching import *
+from .singleflight import *
+from .cache import *
+from .waiters import *
+from .limiter import *
+from .scheduler import *
+from .retry import *
+from .timeouts import *
+from .concurrency import *
+from .services import *
+from .sessions import *
+from .endpoints import *
+from .polling import *
+from .events import *
+from .offload import *
+from .recording import *
+from .store import *
@@ -35,6 +35,11 @@ class ExclusiveAsyncLock:
 
         return wrapper
 
+    def locked(self) -> bool:
+        """Returns True if some operation holds the exclusive access"""
+
+        return self._lock.locked()
+
     async def wait(self) -> None:
         """waits until lock release"""
 
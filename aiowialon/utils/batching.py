@@ -0,0 +1,132 @@
+"""Collector of concurrent calls to send them as a single batch request"""
+
+import asyncio
+import contextvars
+import json
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+from aiowialon.exceptions import WialonInvalidResult
+from aiowialon.logger import logger
+
+BatchSender = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class CallBatcher:
+    """
+    Collects the items submitted by concurrent tasks
+    and flushes them every 'delay' seconds or on reaching 'max_size' items
+    with a single 'send' coroutine call.
+    The 'send' coroutine have to return the list of results in the order of items,
+    the exception instances in this list are raised to the corresponding waiters
+    """
+
+    def __init__(self, send: BatchSender, delay: float = 0.05, max_size: int = 50) -> None:
+        if delay < 0:
+            raise ValueError("CallBatcher delay have to be >= 0")
+        if max_size < 1:
+            raise ValueError("CallBatcher max_size have to be >= 1")
+        self._send: BatchSender = send
+        self.delay: float = delay
+        self.max_size: int = max_size
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of items waiting for the next flush"""
+
+        return len(self._pending)
+
+    async def submit(self, item: Any) -> Any:
+        """Enqueue the item and wait for its own result from the batch"""
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.delay, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Send all the pending items immediately"""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        # the batch is shared by the submitters, so it doesn't inherit the context
+        # (priority, timeouts) of the one that triggered the flush
+        task = contextvars.Context().run(asyncio.ensure_future, self._dispatch(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def cancel(self) -> None:
+        """Cancel the pending items and the batches in flight"""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        for _, future in pending:
+            future.cancel()
+        for task in self._tasks:
+            task.cancel()
+
+    async def _dispatch(self, pending: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Sends the batch and demultiplexes the results to the waiters"""
+
+        logger.debug("Flushing batch of %d calls", len(pending))
+        try:
+            results = await self._send([item for item, _ in pending])
+            if len(results) != len(pending):
+                raise WialonInvalidResult(f"Got {len(results)} results "
+                                          f"for {len(pending)} calls",
+                                          'core_batch', results)
+        except asyncio.CancelledError:
+            for _, future in pending:
+                future.cancel()
+            raise
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for (_, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def split_batch(actions: List[Any], max_size: int, max_bytes: int) -> List[List[Any]]:
+    """
+    Splits the batch actions to the chunks by actions count and by JSON payload size,
+    the single action bigger than 'max_bytes' is sent as a separate chunk
+    """
+
+    if max_size < 1 or max_bytes < 1:
+        raise ValueError("Batch chunk limits have to be >= 1")
+    chunks: List[List[Any]] = []
+    chunk: List[Any] = []
+    chunk_bytes = 0
+    for action in actions:
+        size = len(json.dumps(action, ensure_ascii=False, default=str))
+        if chunk and (len(chunk) >= max_size or chunk_bytes + size > max_bytes):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+        chunk.append(action)
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+__all__ = ['CallBatcher', 'split_batch']
@@ -0,0 +1,208 @@
+"""Response cache for idempotent Wialon Remote API calls"""
+
+import copy
+import shelve
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from aiowialon.logger import logger
+from aiowialon.utils.convention import params_key, prepare_action_params
+
+# Default time to live in seconds for responses of rarely changed services
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    'core_get_hw_types': 3600,
+    'core_get_hw_cmds': 3600,
+    'user_get_locale': 600,
+    'resource_get_zone_data': 300,
+}
+
+CacheEntry = Tuple[float, Any]
+
+
+class CacheBackend(ABC):
+    """
+    Storage interface for the ResponseCache,
+    keeps the (expires_at, value) entries by string keys
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Returns the entry or None if the key is not stored"""
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Stores the entry"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes the entry if it's stored"""
+
+    @abstractmethod
+    def keys(self) -> Iterator[str]:
+        """Iterates over the stored keys"""
+
+    def clear(self) -> None:
+        """Removes all the entries"""
+
+        for key in list(self.keys()):
+            self.delete(key)
+
+    def close(self) -> None:
+        """Release the storage resources"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-memory storage with size-bounded LRU eviction"""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("MemoryCacheBackend maxsize have to be >= 1")
+        self.maxsize: int = maxsize
+        self._data: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def keys(self) -> Iterator[str]:
+        return iter(list(self._data))
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ShelveCacheBackend(CacheBackend):
+    """On-disk storage based on the 'shelve' module, can be shared between runs"""
+
+    def __init__(self, filename: str) -> None:
+        self._shelf: shelve.Shelf = shelve.open(filename)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        return self._shelf.get(key)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._shelf[key] = entry
+
+    def delete(self, key: str) -> None:
+        if key in self._shelf:
+            del self._shelf[key]
+
+    def keys(self) -> Iterator[str]:
+        return iter(list(self._shelf.keys()))
+
+    def close(self) -> None:
+        self._shelf.close()
+
+
+class ResponseCache:
+    """
+    Caches the responses of the calls by action name, user and canonical params
+    with per-action time to live. Only the actions listed in 'ttls' are cached.
+    The responses depend on the access rights, so each user gets own entries.
+    The cached values are copied on read, so the callers can mutate them safely
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None,
+                 backend: Optional[CacheBackend] = None,
+                 namespace: str = "") -> None:
+        """
+        :param ttls: Time to live in seconds by action name, defaults to DEFAULT_CACHE_TTLS
+        :param backend: Entries storage, defaults to MemoryCacheBackend
+        :param namespace: Keys prefix to share the single backend between the clients
+        """
+
+        self.ttls: Dict[str, float] = dict(DEFAULT_CACHE_TTLS if ttls is None else ttls)
+        self.backend: CacheBackend = backend if backend is not None else MemoryCacheBackend()
+        self.namespace: str = namespace
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def is_cached(self, action_name: str) -> bool:
+        """Checks if responses of the action are cached"""
+
+        return self.ttls.get(action_name, 0) > 0
+
+    def _key(self, action_name: str, key: str, user: Optional[int]) -> str:
+        return f"{self.namespace}:{action_name}:{'' if user is None else user}:{key}"
+
+    def get(self, action_name: str, key: str, user: Optional[int] = None) -> Tuple[bool, Any]:
+        """
+        Returns (True, value) on hit or (False, None) on miss,
+        key is the 'convention.params_key' of prepared call params,
+        user is the id of the logged in user the response is got for
+        """
+
+        key = self._key(action_name, key, user)
+        entry = self.backend.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.time():
+                self.hits += 1
+                return True, copy.deepcopy(value)
+            self.backend.delete(key)
+        self.misses += 1
+        return False, None
+
+    def set(self, action_name: str, key: str, value: Any, user: Optional[int] = None) -> None:
+        """Stores the response of the user for the action ttl"""
+
+        ttl = self.ttls.get(action_name, 0)
+        if ttl > 0:
+            self.backend.set(self._key(action_name, key, user),
+                             (time.time() + ttl, copy.deepcopy(value)))
+
+    def invalidate(self, action_name: Optional[str] = None,
+                   params: Optional[Dict[str, Any]] = None,
+                   user: Optional[int] = None) -> None:
+        """
+        Removes the cached responses matching the action, call params and user,
+        all of them if nothing is passed
+        Example:
+        >>> cache.invalidate('core_search_item', {'id': 734455, 'flags': 1})
+        """
+
+        key = None if params is None else params_key(prepare_action_params(params))
+        if action_name is not None and key is not None and user is not None:
+            self.backend.delete(self._key(action_name, key, user))
+            return
+        prefix = f"{self.namespace}:"
+        # the stored key parts after the namespace, None matches any
+        wanted = (action_name, None if user is None else str(user), key)
+        for stored in self.backend.keys():
+            if not stored.startswith(prefix):
+                continue
+            parts = stored[len(prefix):].split(':', 2)
+            if len(parts) == 3 and all(value is None or value == part
+                                       for value, part in zip(wanted, parts)):
+                self.backend.delete(stored)
+        logger.debug("Response cache invalidated: %s%s", prefix, action_name or '')
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters"""
+
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+__all__ = (
+    'DEFAULT_CACHE_TTLS',
+    'CacheBackend',
+    'MemoryCacheBackend',
+    'ShelveCacheBackend',
+    'ResponseCache',
+)
@@ -0,0 +1,166 @@
+"""Limiters of the number of requests in flight"""
+
+import asyncio
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from aiowialon.utils.waiters import wait_admission
+
+
+class ConcurrencyLimiter:
+    """
+    Async semaphore with the limit that can be changed at runtime,
+    base class for the adaptive concurrency limiters
+    """
+
+    def __init__(self, limit: int = 10) -> None:
+        if limit < 1:
+            raise ValueError("ConcurrencyLimiter limit have to be >= 1")
+        self._limit: int = limit
+        self._inflight: int = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Max requests in flight"""
+
+        return self._limit
+
+    @limit.setter
+    def limit(self, limit: int) -> None:
+        """Updates the limit and wakes up the waiters if it's increased"""
+
+        if limit < 1:
+            raise ValueError("ConcurrencyLimiter limit have to be >= 1")
+        self._limit = limit
+        self._wakeup()
+
+    @property
+    def inflight(self) -> int:
+        """Number of requests in flight"""
+
+        return self._inflight
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for the slot"""
+
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Waits for the free slot"""
+
+        if self._inflight < self._limit and not self._waiters:
+            self._inflight += 1
+            return
+        await wait_admission(self._waiters, self.release)
+
+    def release(self) -> None:
+        """Frees the slot"""
+
+        self._inflight -= 1
+        self._wakeup()
+
+    def _wakeup(self) -> None:
+        while self._waiters and self._inflight < self._limit:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._inflight += 1
+            future.set_result(None)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def on_sample(self, latency: float, dropped: bool = False) -> None:
+        """
+        Feedback of the finished request, used by the adaptive limiters
+        :param latency: Request latency in seconds
+        :param dropped: True if the server rejected the request as overloaded
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the current limiter state"""
+
+        return {'limit': self._limit, 'inflight': self._inflight, 'waiting': len(self._waiters)}
+
+
+# pylint: disable=too-many-instance-attributes
+class GradientConcurrencyLimiter(ConcurrencyLimiter):
+    """
+    Adaptive concurrency limiter driven by the latency gradient (like Netflix gradient2).
+    Compares short-term and long-term average latency:
+    raises the limit while latency stays flat and lowers it when queueing appears,
+    multiplies the limit by 'backoff' when server rejects the request as overloaded
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, limit: int = 10, min_limit: int = 1, max_limit: int = 100, *,
+                 tolerance: float = 1.5,
+                 smoothing: float = 0.2,
+                 backoff: float = 0.9,
+                 long_window: int = 600) -> None:
+        """
+        :param limit: Initial limit
+        :param min_limit: Lower bound of the limit
+        :param max_limit: Upper bound of the limit
+        :param tolerance: Allowed ratio of short-term to long-term latency before shrinking
+        :param smoothing: Weight of the new estimation in the limit, in range (0, 1]
+        :param backoff: Limit multiplier on the rejected requests, in range (0, 1)
+        :param long_window: Number of samples averaged by long-term latency
+        """
+
+        if not 1 <= min_limit <= limit <= max_limit:
+            raise ValueError("GradientConcurrencyLimiter requires "
+                             "1 <= min_limit <= limit <= max_limit")
+        super().__init__(limit)
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.tolerance: float = tolerance
+        self.smoothing: float = smoothing
+        self.backoff: float = backoff
+        self._long_factor: float = 2 / (long_window + 1)
+        self._estimated: float = limit
+        self._short_rtt: Optional[float] = None
+        self._long_rtt: Optional[float] = None
+
+    def on_sample(self, latency: float, dropped: bool = False) -> None:
+        if dropped:
+            self._set_estimated(self._estimated * self.backoff)
+            return
+
+        if self._short_rtt is None or self._long_rtt is None:
+            self._short_rtt = self._long_rtt = latency
+            return
+        self._short_rtt = 0.9 * self._short_rtt + 0.1 * latency
+        self._long_rtt = (1 - self._long_factor) * self._long_rtt + self._long_factor * latency
+        # let the long-term latency recover faster after the steady-state growth
+        if self._long_rtt / self._short_rtt > 2:
+            self._long_rtt *= 0.95
+
+        # don't grow if the limit is not used
+        if self._inflight < self._estimated / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / self._short_rtt))
+        new_limit = self._estimated * gradient + math.sqrt(self._estimated)
+        self._set_estimated(self._estimated * (1 - self.smoothing) + new_limit * self.smoothing)
+
+    def _set_estimated(self, estimated: float) -> None:
+        self._estimated = max(self.min_limit, min(self.max_limit, estimated))
+        self.limit = max(1, int(self._estimated))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update(short_rtt=self._short_rtt, long_rtt=self._long_rtt)
+        return stats
+
+
+__all__ = (
+    'ConcurrencyLimiter',
+    'GradientConcurrencyLimiter',
+)
@@ -3,9 +3,12 @@ Special convention module
 to resolve Wialon Remote API specific usage cases with python
 """
 
-from typing import Any, Dict
+import json
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
 
+@lru_cache(maxsize=1024)
 def prepare_action_name(action_name: str) -> str:
     """
     Uses for replacing a call 'action_name' with Wialon Remote API 'svc' name
@@ -16,6 +19,21 @@ def prepare_action_name(action_name: str) -> str:
     return action_name.lower().replace('_', '/', 1)
 
 
+@lru_cache(maxsize=4096)
+def prepare_param_name(name: str) -> str:
+    """
+    Replaces single parameter name with adjusted to Wialon Remote API
+    Example:
+    >>> 'from_' -> 'from'
+    >>> 'ItemId' -> 'itemId'
+    """
+
+    # Remove trailing underscores
+    new_name = name.strip('_')
+    # Convert CapitalisedKey to capitalisedParam
+    return new_name[:1].lower() + new_name[1:] if new_name else ''
+
+
 def prepare_action_params(params: dict) -> dict:
     """
     Resolves params names conflicts with Wialon Remote API.
@@ -24,6 +42,8 @@ def prepare_action_params(params: dict) -> dict:
     with adding leading and traileng underscores to its names
     and use Capitalised names for API Calls.
     Removes trailing and leading underscores and replaces firs letter with lowercase
+    Processes nested dictionaries and dictionaries in lists.
+    The dictionaries and lists that don't need changes are returned as is, without copying
     Example:
     >>> 'from_' -> 'from'
     >>> 'ItemId' -> 'itemId'
@@ -33,27 +53,130 @@ def prepare_action_params(params: dict) -> dict:
     if not isinstance(params, dict):
         return params
 
-    new_params: Dict[str, Any] = {}
-    for k, v in params.items():
-        # Remove trailing underscores
-        new_key = k.strip('_')
-
-        # Convert CapitalisedKey to capitalisedParam
-        new_key = new_key[:1].lower() + new_key[1:] if new_key else ''
-
-        # Process nested dictionaries and lists
-        if isinstance(v, dict):
-            new_params[new_key] = prepare_action_params(v)
-        elif isinstance(v, list):
-            new_params[new_key] = [prepare_action_params(item)
-                                   if isinstance(item, dict)
-                                   else item for item in v]
+    prepared: Dict[int, Any] = {}
+    result = _prepare_dict(params, prepared)
+    if not isinstance(result, _NotReady):
+        # fast path for the flat params
+        return result
+
+    # Iterative post-order traversal, the node is prepared as soon as its children are ready.
+    # The expanded nodes not prepared yet are the ancestors of the nodes above them in the stack,
+    # the shared node can be pushed more than once and is prepared by its first pop
+    stack: List[Any] = [params]
+    expanded: Set[int] = set()
+    while stack:
+        node = stack[-1]
+        if id(node) in prepared:
+            stack.pop()
+            continue
+        if isinstance(node, dict):
+            result = _prepare_dict(node, prepared)
+        else:
+            result = _prepare_list(node, prepared)
+        if isinstance(result, _NotReady):
+            expanded.add(id(node))
+            for child in {id(c): c for c in result.children}.values():
+                if id(child) in expanded:
+                    raise ValueError("Params contain a circular reference")
+                stack.append(child)
         else:
-            new_params[new_key] = v
-    return new_params
+            prepared[id(node)] = result
+            expanded.discard(id(node))
+            stack.pop()
+    return prepared[id(params)]
+
+
+class _NotReady:  # pylint: disable=too-few-public-methods
+    """Keeps the children of the node that have to be prepared before it"""
+
+    __slots__ = ('children',)
+
+    def __init__(self, children: List[Any]) -> None:
+        self.children = children
+
+
+@lru_cache(maxsize=1024)
+def _prepare_param_names(names: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+    """Returns prepared names of the dict keys, or None if they are already in Wialon form"""
+
+    new_names = tuple(prepare_param_name(n) if isinstance(n, str) else n for n in names)
+    return None if new_names == names else new_names
+
+
+@lru_cache(maxsize=256)
+def _has_subclass(types: FrozenSet[type], base: Union[type, Tuple[type, ...]]) -> bool:
+    return any(issubclass(t, base) for t in types)
+
+
+def _prepare_dict(node: Dict[Any, Any], prepared: Dict[int, Any]) -> Any:
+    """
+    Returns the dict with prepared names, copies it only if anything changed,
+    or _NotReady with the children to be prepared first
+    """
+
+    new_names = _prepare_param_names(tuple(node))
+    values = node.values()
+    if not _has_subclass(frozenset(map(type, values)), (dict, list)):
+        # fast path for the dict of scalars
+        return node if new_names is None else dict(zip(new_names, values))
+
+    children = [v for v in values if isinstance(v, (dict, list))]
+    not_ready = [v for v in children if id(v) not in prepared]
+    if not_ready:
+        return _NotReady(not_ready)
+    if new_names is None and all(prepared[id(v)] is v for v in children):
+        return node
+    return dict(zip(new_names or tuple(node),
+                    [prepared[id(v)] if isinstance(v, (dict, list)) else v for v in values]))
+
+
+def _prepare_list(node: List[Any], prepared: Dict[int, Any]) -> Any:
+    """
+    Returns the list with prepared dict items, copies it only if anything changed,
+    or _NotReady with the items to be prepared first
+    """
+
+    if not _has_subclass(frozenset(map(type, node)), dict):
+        # fast path for the list of scalars
+        return node
+
+    new_node: List[Any] = []
+    not_ready: List[Any] = []
+    changed = False
+    for item in node:
+        if isinstance(item, dict):
+            new_item = prepared.get(id(item))
+            if new_item is None:
+                # the dicts of scalars are prepared in place
+                new_item = _prepare_dict(item, prepared)
+                if isinstance(new_item, _NotReady):
+                    not_ready.append(item)
+                    continue
+                prepared[id(item)] = new_item
+            if new_item is not item:
+                changed = True
+            item = new_item
+        new_node.append(item)
+    if not_ready:
+        return _NotReady(not_ready)
+    return new_node if changed else node
+
+
+def params_key(params: Any) -> str:
+    """
+    Returns canonical string representation of the prepared action params,
+    equal params give equal keys regardless of the keys order
+    Example:
+    >>> params_key({'id': 1, 'flags': 1}) == params_key({'flags': 1, 'id': 1})
+    """
+
+    return json.dumps(params, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False, default=str)
 
 
 __all__ = (
     'prepare_action_name',
-    'prepare_action_params'
+    'prepare_action_params',
+    'prepare_param_name',
+    'params_key',
 )
@@ -0,0 +1,153 @@
+"""Multiple Wialon hosts with health tracking, failover and latency-weighted balancing"""
+
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from aiowialon.logger import logger
+
+
+class Endpoint:
+    """Wialon host state"""
+
+    __slots__ = ('url', 'latency', 'failures', 'down_until', 'requests')
+
+    def __init__(self, url: str) -> None:
+        self.url: str = url.rstrip('/') + '/'
+        self.latency: Optional[float] = None
+        self.failures: int = 0
+        self.down_until: float = 0
+        self.requests: int = 0
+
+    def available(self, now: Optional[float] = None) -> bool:
+        """Checks if the host is not marked as failed"""
+
+        return self.down_until <= (time.monotonic() if now is None else now)
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url!r})"
+
+
+class EndpointPool:
+    """
+    Chooses the Wialon host for each request.
+    If the hosts share the sessions, the requests are balanced over the available hosts
+    weighted by their latency, otherwise all the requests are sent to the active host
+    and the client switches to the next available one when the active host fails
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, urls: Iterable[str], *,
+                 shared_sessions: bool = False,
+                 cooldown: float = 30,
+                 check_interval: Optional[float] = 10,
+                 smoothing: float = 0.2) -> None:
+        """
+        :param urls: Base urls of the hosts, e.g. 'https://node1.example.com:8022'
+        :param shared_sessions: Session opened on one host is valid on the others
+        :param cooldown: Seconds the failed host is excluded from the selection
+        :param check_interval: Seconds between the health checks of the failed hosts,
+                               None to disable the health checks
+        :param smoothing: Weight of the new sample in the host latency, in range (0, 1]
+        """
+
+        self.endpoints: List[Endpoint] = [Endpoint(url) for url in urls]
+        if not self.endpoints:
+            raise ValueError("EndpointPool requires at least one url")
+        self.shared_sessions: bool = shared_sessions
+        self.cooldown: float = cooldown
+        self.check_interval: Optional[float] = check_interval
+        self.smoothing: float = smoothing
+        self._active: Endpoint = self.endpoints[0]
+
+    @property
+    def active(self) -> Endpoint:
+        """The host used for the requests if the sessions are not shared"""
+
+        return self._active
+
+    def select(self) -> Endpoint:
+        """Chooses the host for the next request"""
+
+        if not self.shared_sessions:
+            endpoint = self._active
+        else:
+            endpoint = self._weighted_choice()
+        endpoint.requests += 1
+        return endpoint
+
+    def _weighted_choice(self) -> Endpoint:
+        now = time.monotonic()
+        available = [e for e in self.endpoints if e.available(now)]
+        if not available:
+            # all the hosts failed, try the one to recover first
+            return min(self.endpoints, key=lambda e: e.down_until)
+        if len(available) == 1:
+            return available[0]
+        known = [e.latency for e in available if e.latency is not None]
+        # the hosts without samples are tried as the fastest one
+        default = min(known) if known else 1.0
+        weights = [1 / max(e.latency if e.latency is not None else default, 1e-3)
+                   for e in available]
+        return random.choices(available, weights)[0]
+
+    def on_success(self, endpoint: Endpoint, latency: float) -> None:
+        """Feedback of the successful request"""
+
+        if endpoint.latency is None:
+            endpoint.latency = latency
+        else:
+            endpoint.latency += self.smoothing * (latency - endpoint.latency)
+        endpoint.failures = 0
+        endpoint.down_until = 0
+
+    def on_failure(self, endpoint: Endpoint) -> bool:
+        """
+        Feedback of the request failed with connection error or 5xx response,
+        returns True if the active host was switched
+        """
+
+        now = time.monotonic()
+        if endpoint.available(now):
+            logger.warning("Wialon host %s marked as failed", endpoint.url)
+        endpoint.failures += 1
+        endpoint.down_until = now + self.cooldown
+        if self.shared_sessions or endpoint is not self._active:
+            return False
+        return self._failover()
+
+    def _failover(self) -> bool:
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e is not self._active and e.available(now)]
+        if not candidates:
+            return False
+        self._active = min(candidates,
+                           key=lambda e: (e.latency is None, e.latency or 0))
+        logger.warning("Wialon host switched to %s", self._active.url)
+        return True
+
+    def failed(self) -> List[Endpoint]:
+        """Returns the hosts excluded from the selection"""
+
+        now = time.monotonic()
+        return [e for e in self.endpoints if not e.available(now)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hosts state by url"""
+
+        now = time.monotonic()
+        return {
+            e.url: {
+                'available': e.available(now),
+                'active': e is self._active,
+                'latency': e.latency,
+                'failures': e.failures,
+                'requests': e.requests,
+            } for e in self.endpoints
+        }
+
+
+__all__ = (
+    'Endpoint',
+    'EndpointPool',
+)
@@ -0,0 +1,246 @@
+"""Bounded queue of AVL events between the poller and the handlers"""
+
+import asyncio
+from collections import deque
+from functools import partial
+from typing import Any, Deque, Dict, Hashable, List, Literal, Optional
+
+from aiowialon.utils.waiters import wait_admission
+
+OverflowPolicy = Literal['block', 'drop_oldest', 'coalesce']
+
+
+def _coalesce_key(event: Any) -> Hashable:
+    return event.data.i, event.data.t
+
+
+# pylint: disable=too-many-instance-attributes
+class EventQueue:
+    """
+    Bounded FIFO queue of AVL events with an overflow policy:
+    'block' - the poller waits for the free slot, so the polling slows down with the handlers,
+    'drop_oldest' - the oldest queued event is dropped,
+    'coalesce' - the queued event of the same item and type is replaced with the new one,
+    the poller waits if there is no such event.
+    The events are processed by 'workers' concurrent dispatchers,
+    if 'ordered', each worker gets its own shard of items by 'event.data.i',
+    so the events of the same item are processed one by one in order
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, maxsize: int = 10000, *,
+                 overflow: OverflowPolicy = 'block',
+                 workers: int = 10,
+                 ordered: bool = False) -> None:
+        """
+        :param maxsize: Max queued events
+        :param overflow: Policy applied when the queue is full
+        :param workers: Number of events handled at the same time
+        :param ordered: Shard the events by item between the workers to keep their order
+        """
+
+        if maxsize < 1:
+            raise ValueError("EventQueue maxsize have to be >= 1")
+        if workers < 1:
+            raise ValueError("EventQueue workers have to be >= 1")
+        if overflow not in ('block', 'drop_oldest', 'coalesce'):
+            raise ValueError(f"Unknown EventQueue overflow policy: {overflow}")
+        self.maxsize: int = maxsize
+        self.overflow: OverflowPolicy = overflow
+        self.workers: int = workers
+        self.ordered: bool = ordered
+        # the events are kept in the mutable holders [event, seq] to be replaced in place
+        # on coalescing, 'seq' defines the oldest event between the shards
+        self._shards: List[Deque[List[Any]]] = [deque() for _ in range(workers if ordered else 1)]
+        self._getters: List[Deque[asyncio.Future]] = [deque() for _ in self._shards]
+        self._latest: Dict[Hashable, List[Any]] = {}
+        self._size: int = 0
+        self._seq: int = 0
+        self._putters: Deque[asyncio.Future] = deque()
+        self._joiners: Deque[asyncio.Future] = deque()
+        self._unfinished: int = 0
+        self._max_depth: int = 0
+        self._put: int = 0
+        self._dropped: int = 0
+        self._coalesced: int = 0
+        self._blocked: int = 0
+        self._processed: int = 0
+        self._closed: bool = False
+
+    def qsize(self) -> int:
+        """Number of queued events"""
+
+        return self._size
+
+    def full(self) -> bool:
+        """Checks if there are maxsize queued events"""
+
+        return self._size >= self.maxsize
+
+    @property
+    def closed(self) -> bool:
+        """Checks if the queue doesn't accept the events anymore"""
+
+        return self._closed
+
+    def close(self) -> None:
+        """Stops accepting the events, the queued ones still can be got"""
+
+        self._closed = True
+        for waiters in (*self._getters, self._putters):
+            while waiters:
+                self._wakeup(waiters)
+
+    async def put(self, event: Any) -> None:
+        """
+        Puts the event to the queue, applying the overflow policy if it's full,
+        the event is dropped if the queue is closed
+        """
+
+        if self._closed:
+            return
+        if self.full():
+            if self.overflow == 'drop_oldest':
+                self._pop(self._oldest_shard())
+                self._dropped += 1
+                self._finish(1)
+            elif self.overflow == 'coalesce' and self._replace(event):
+                return
+            else:
+                self._blocked += 1
+                while self.full():
+                    await self._wait(self._putters)
+                    if self._closed:
+                        return
+        self._append(event)
+
+    async def get(self, worker: int = 0) -> Optional[Any]:
+        """
+        Waits for the next event, returns None if the queue is closed and drained
+        :param worker: Worker index in range [0, workers), selects the shard if ordered
+        """
+
+        shard = worker if self.ordered else 0
+        while not self._shards[shard]:
+            if self._closed:
+                return None
+            await self._wait(self._getters[shard])
+        return self._pop(shard)
+
+    async def get_batch(self, size: int, worker: int = 0) -> List[Any]:
+        """
+        Waits for the next event and returns it with up to 'size' queued events,
+        returns empty list if the queue is closed and drained
+        :param worker: Worker index in range [0, workers), selects the shard if ordered
+        """
+
+        shard = worker if self.ordered else 0
+        while not self._shards[shard]:
+            if self._closed:
+                return []
+            await self._wait(self._getters[shard])
+        return [self._pop(shard) for _ in range(min(size, len(self._shards[shard])))]
+
+    def task_done(self, count: int = 1) -> None:
+        """Counts the events got from the queue as processed"""
+
+        self._processed += count
+        self._finish(count)
+
+    async def join(self) -> None:
+        """Waits until all the queued events are processed"""
+
+        while self._unfinished > 0:
+            await self._wait(self._joiners)
+
+    def _finish(self, count: int) -> None:
+        self._unfinished = max(0, self._unfinished - count)
+        if not self._unfinished:
+            while self._joiners:
+                self._wakeup(self._joiners)
+
+    def clear(self) -> int:
+        """Drops all the queued events, returns their number"""
+
+        dropped = self._size
+        for items in self._shards:
+            items.clear()
+        self._latest.clear()
+        self._size = 0
+        self._wakeup(self._putters)
+        self._finish(dropped)
+        return dropped
+
+    def _shard_of(self, event: Any) -> int:
+        return event.data.i % len(self._shards) if self.ordered else 0
+
+    def _oldest_shard(self) -> int:
+        if not self.ordered:
+            return 0
+        return min((i for i, items in enumerate(self._shards) if items),
+                   key=lambda i: self._shards[i][0][1])
+
+    def _append(self, event: Any) -> None:
+        shard = self._shard_of(event)
+        holder = [event, self._seq]
+        self._seq += 1
+        self._shards[shard].append(holder)
+        self._size += 1
+        self._unfinished += 1
+        if self.overflow == 'coalesce':
+            self._latest[_coalesce_key(event)] = holder
+        self._put += 1
+        self._max_depth = max(self._max_depth, self._size)
+        self._wakeup(self._getters[shard])
+
+    def _pop(self, shard: int) -> Any:
+        holder = self._shards[shard].popleft()
+        self._size -= 1
+        event = holder[0]
+        if self.overflow == 'coalesce':
+            key = _coalesce_key(event)
+            if self._latest.get(key) is holder:
+                del self._latest[key]
+        self._wakeup(self._putters)
+        return event
+
+    def _replace(self, event: Any) -> bool:
+        holder = self._latest.get(_coalesce_key(event))
+        if holder is None:
+            return False
+        holder[0] = event
+        self._coalesced += 1
+        return True
+
+    @classmethod
+    async def _wait(cls, waiters: Deque[asyncio.Future]) -> None:
+        # woken up right before the cancellation passes the wakeup to the next waiter
+        await wait_admission(waiters, partial(cls._wakeup, waiters))
+
+    @staticmethod
+    def _wakeup(waiters: Deque[asyncio.Future]) -> None:
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the queue depth and the events counters"""
+
+        return {
+            'depth': self._size,
+            'max_depth': self._max_depth,
+            'maxsize': self.maxsize,
+            'put': self._put,
+            'processed': self._processed,
+            'dropped': self._dropped,
+            'coalesced': self._coalesced,
+            'blocked': self._blocked,
+        }
+
+
+__all__ = (
+    'OverflowPolicy',
+    'EventQueue',
+)
@@ -0,0 +1,145 @@
+"""Adaptive requests rate limiter driven by the Wialon throttling errors"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from aiowialon.exceptions import WialonError
+from aiowialon.logger import logger
+
+# Wialon error codes meaning the server asks to slow down
+THROTTLING_ERROR_CODES = frozenset({10, 1003})
+
+
+def is_throttling_error(err: BaseException) -> bool:
+    """Checks if exception, or any of batch call exceptions, is a server throttling error"""
+
+    if not isinstance(err, WialonError):
+        return False
+    if err.code in THROTTLING_ERROR_CODES:
+        return True
+    if isinstance(err.reason, (list, tuple)):
+        return any(is_throttling_error(e) for e in err.reason if isinstance(e, BaseException))
+    return False
+
+
+# pylint: disable=too-many-instance-attributes
+class AdaptiveRateLimiter:
+    """
+    Async requests rate limiter with AIMD (additive increase, multiplicative decrease) control.
+    The rate grows by 'increase' requests per second for each second of successful calls
+    and is multiplied by 'decrease' on throttling errors or on rising latency,
+    staying within [min_rate, max_rate] bounds.
+    Allows bursts of up to one second worth of requests, like 'AsyncLimiter(rate, 1)'
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, rate: float = 10, min_rate: float = 1, max_rate: float = 50, *,
+                 increase: float = 1, decrease: float = 0.5,
+                 latency_tolerance: Optional[float] = None,
+                 cooldown: float = 1) -> None:
+        """
+        :param rate: Initial requests per second
+        :param min_rate: Lower bound of requests per second
+        :param max_rate: Upper bound of requests per second
+        :param increase: Requests per second added per second of successful calls
+        :param decrease: Rate multiplier on throttling, in range (0, 1)
+        :param latency_tolerance: Back off when average latency exceeds the best one
+                                  this many times (e.g. 2.0), None to ignore latency
+        :param cooldown: Min seconds between two consecutive decreases
+        """
+
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError("AdaptiveRateLimiter requires 0 < min_rate <= rate <= max_rate")
+        if not 0 < decrease < 1:
+            raise ValueError("AdaptiveRateLimiter decrease have to be in range (0, 1)")
+        self._rate: float = rate
+        self.min_rate: float = min_rate
+        self.max_rate: float = max_rate
+        self.increase: float = increase
+        self.decrease: float = decrease
+        self.latency_tolerance: Optional[float] = latency_tolerance
+        self.cooldown: float = cooldown
+
+        self._tat: float = 0  # theoretical arrival time of the next request
+        self._last_decrease: float = 0
+        self._latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self.throttled: int = 0
+
+    @property
+    def rate(self) -> float:
+        """Current requests per second"""
+
+        return self._rate
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Moving average of the calls latency in seconds"""
+
+        return self._latency
+
+    async def acquire(self) -> None:
+        """Waits for the slot to send the request"""
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        interval = 1 / self._rate
+        tat = max(self._tat, now)
+        self._tat = tat + interval
+        delay = tat - now - (1 - interval)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+    def on_success(self, latency: Optional[float] = None) -> None:
+        """Feedback of successful call, latency in seconds"""
+
+        if latency is not None:
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency = 0.8 * self._latency + 0.2 * latency
+            if self._best_latency is None or self._latency < self._best_latency:
+                self._best_latency = self._latency
+            if (self.latency_tolerance is not None
+                    and self._latency > self._best_latency * self.latency_tolerance):
+                self._backoff("rising latency")
+                return
+        self._rate = min(self.max_rate, self._rate + self.increase / self._rate)
+
+    def on_throttled(self) -> None:
+        """Feedback of the call failed with server throttling error"""
+
+        self.throttled += 1
+        self._backoff("throttling error")
+
+    def _backoff(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._rate = max(self.min_rate, self._rate * self.decrease)
+        logger.debug("Requests rate decreased to %.2f rps on %s", self._rate, reason)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the current limiter state"""
+
+        return {
+            'rate': self._rate,
+            'latency': self._latency,
+            'best_latency': self._best_latency,
+            'throttled': self.throttled,
+        }
+
+
+__all__ = (
+    'AdaptiveRateLimiter',
+    'THROTTLING_ERROR_CODES',
+    'is_throttling_error',
+)
@@ -0,0 +1,114 @@
+"""Offload of CPU-heavy AVL events processing to the worker processes"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from aiowialon.utils.batching import CallBatcher
+
+OffloadFunc = Callable[[Any], Any]
+
+
+def _run_batch(func: OffloadFunc, events: List[Any]) -> List[Any]:
+    """Runs in the worker process, the exceptions are returned to the waiters of their events"""
+
+    results: List[Any] = []
+    for event in events:
+        try:
+            results.append(func(event))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results.append(e)
+    return results
+
+
+# pylint: disable=too-many-instance-attributes
+class ProcessOffload:
+    """
+    Runs the function over the AVL events in the worker processes.
+    The events are sent to the workers in batches collected for 'delay' seconds
+    or up to 'batch_size' events, the events of the same item always go to the same worker,
+    so they are processed in order and the worker can keep the item state.
+    The function and its results have to be picklable, so define it on a module level
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, func: OffloadFunc, workers: Optional[int] = None, *,
+                 batch_size: int = 100,
+                 delay: float = 0.005,
+                 mp_context: Any = None) -> None:
+        """
+        :param func: Function of the AvlEvent returning the result for the handler
+        :param workers: Number of worker processes, os.cpu_count() by default
+        :param batch_size: Max events sent to the worker at once
+        :param delay: Seconds to collect the batch
+        :param mp_context: Multiprocessing context of the workers, e.g. 'spawn' one
+        """
+
+        self.func: OffloadFunc = func
+        self.workers: int = workers if workers is not None else os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("ProcessOffload workers have to be >= 1")
+        self.batch_size: int = batch_size
+        self.delay: float = delay
+        self.mp_context: Any = mp_context
+        self._executors: List[Optional[ProcessPoolExecutor]] = [None] * self.workers
+        self._batchers: List[CallBatcher] = [
+            CallBatcher(partial(self._send, worker), delay, batch_size)
+            for worker in range(self.workers)
+        ]
+        self._submitted: int = 0
+
+    def _executor(self, worker: int) -> ProcessPoolExecutor:
+        executor = self._executors[worker]
+        if executor is None:
+            # single process per worker keeps the items affinity and the order of their events
+            executor = ProcessPoolExecutor(1, mp_context=self.mp_context)
+            self._executors[worker] = executor
+        return executor
+
+    async def _send(self, worker: int, events: List[Any]) -> List[Any]:
+        executor = self._executor(worker)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, _run_batch, self.func, events
+            )
+        except BrokenProcessPool:
+            # the worker process died, the next batch starts the new one
+            if self._executors[worker] is executor:
+                self._executors[worker] = None
+            executor.shutdown(wait=False)
+            raise
+
+    async def submit(self, event: Any) -> Any:
+        """Processes the event in the worker of its item and returns the result"""
+
+        self._submitted += 1
+        return await self._batchers[event.data.i % self.workers].submit(event)
+
+    def close(self) -> None:
+        """Cancels the pending events and shuts the workers down, they are restarted on submit"""
+
+        for batcher in self._batchers:
+            batcher.cancel()
+        for worker, executor in enumerate(self._executors):
+            if executor is not None:
+                executor.shutdown(wait=False)
+                self._executors[worker] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the submitted and pending events counters"""
+
+        return {
+            'workers': self.workers,
+            'submitted': self._submitted,
+            'pending': [batcher.pending for batcher in self._batchers],
+        }
+
+
+__all__ = (
+    'OffloadFunc',
+    'ProcessOffload',
+)
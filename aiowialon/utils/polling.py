@@ -0,0 +1,80 @@
+"""Adaptive interval between the AVL events polling requests"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+# pylint: disable=too-many-instance-attributes
+class PollingCadence:
+    """
+    Chooses the delay before the next 'avl_evts' request by the number of received events:
+    polls again immediately after a burst, keeps the base interval while events are coming
+    and backs off gradually when idle.
+    Never exceeds 'budget' requests per 'window' seconds
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, interval: float = 2, min_interval: float = 0, max_interval: float = 10, *,
+                 burst_events: int = 500,
+                 backoff: float = 1.5,
+                 budget: int = 10,
+                 window: float = 10) -> None:
+        """
+        :param interval: Delay in seconds while the events are coming
+        :param min_interval: Delay in seconds after a burst
+        :param max_interval: Upper bound of the delay in seconds when idle
+        :param burst_events: Number of events in response considered as a burst
+        :param backoff: Delay multiplier for each next empty response
+        :param budget: Max requests per 'window', 10 per 10 seconds is the Wialon limit
+        :param window: Budget window in seconds
+        """
+
+        if not 0 <= min_interval <= interval <= max_interval:
+            raise ValueError("PollingCadence requires "
+                             "0 <= min_interval <= interval <= max_interval")
+        if budget < 1 or window <= 0:
+            raise ValueError("PollingCadence budget have to be >= 1 per positive window")
+        self.interval: float = interval
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.burst_events: int = burst_events
+        self.backoff: float = backoff
+        self.budget: int = budget
+        self.window: float = window
+        self._delay: float = interval
+        self._polls: Deque[float] = deque(maxlen=budget)
+
+    def on_poll(self) -> None:
+        """Counts the request in the budget, call it right before the request"""
+
+        self._polls.append(time.monotonic())
+
+    def next_delay(self, events: int) -> float:
+        """Returns the delay in seconds before the next request"""
+
+        if events >= self.burst_events:
+            self._delay = self.min_interval
+        elif events > 0:
+            self._delay = self.interval
+        else:
+            self._delay = min(self.max_interval, max(self._delay, self.interval) * self.backoff)
+        return max(self._delay, self._budget_delay())
+
+    def _budget_delay(self) -> float:
+        if len(self._polls) < self.budget:
+            return 0
+        # the oldest request of the full budget has to leave the window
+        return max(0.0, self._polls[0] + self.window - time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the current delay and the requests in the budget window"""
+
+        now = time.monotonic()
+        return {
+            'delay': self._delay,
+            'window_polls': sum(1 for polled in self._polls if now - polled < self.window),
+        }
+
+
+__all__ = ['PollingCadence']
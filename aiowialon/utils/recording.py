@@ -0,0 +1,257 @@
+"""Recording of the raw 'avl_evts' responses and their replay"""
+
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import zlib
+from contextlib import suppress
+from typing import IO, Any, AsyncIterator, Dict, Iterator, Optional, Tuple, cast
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_GZIP_WBITS = zlib.MAX_WBITS | 16
+_CHUNK_SIZE = 1 << 16
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    Reads the recorded responses with their receive time,
+    the truncated tail of the recording interrupted by the crash is skipped
+    """
+
+    with open(path, 'rb') as raw:
+        compressed = raw.read(2) == _GZIP_MAGIC
+    with gzip.open(path, 'rb') if compressed else open(path, 'rb') as file:
+        try:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                record = json.loads(line)
+                yield record['t'], record['r']
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            return
+
+
+def _unterminated_member(path: str) -> Optional[int]:
+    """Returns the offset of the gzip member left unterminated by the crash, if any"""
+
+    member = offset = 0
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    with open(path, 'rb') as file:
+        while True:
+            data = file.read(_CHUNK_SIZE)
+            if not data:
+                break
+            while data:
+                try:
+                    decompressor.decompress(data)
+                except zlib.error:
+                    return member
+                if not decompressor.eof:
+                    offset += len(data)
+                    break
+                # the member ended in this chunk, the next one starts after it
+                offset += len(data) - len(decompressor.unused_data)
+                member = offset
+                data = decompressor.unused_data
+                decompressor = zlib.decompressobj(_GZIP_WBITS)
+    return None if member == offset else member
+
+
+def _complete_lines(file: IO[bytes], decompressor: Any) -> Iterator[bytes]:
+    """Yields the complete records decompressed from the file till the first damaged one"""
+
+    rest = b''
+    while True:
+        data = file.read(_CHUNK_SIZE)
+        if not data:
+            return
+        try:
+            lines = (rest + decompressor.decompress(data)).split(b'\n')
+        except zlib.error:
+            return
+        rest = lines.pop()
+        for line in lines:
+            try:
+                json.loads(line)
+            except ValueError:
+                return
+            yield line + b'\n'
+
+
+def _repair_gzip_tail(path: str, member: int) -> None:
+    """Replaces the unterminated gzip member with the new one of its complete records"""
+
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    with open(path, 'r+b') as file, tempfile.TemporaryFile() as recovered:
+        file.seek(member)
+        with gzip.GzipFile(fileobj=recovered, mode='wb') as output:
+            for line in _complete_lines(file, decompressor):
+                output.write(line)
+        file.truncate(member)
+        file.seek(member)
+        recovered.seek(0)
+        shutil.copyfileobj(recovered, file)
+
+
+def _truncate_partial_line(path: str) -> None:
+    """Drops the record left incomplete by the crash at the end of the plain file"""
+
+    with open(path, 'r+b') as file:
+        end = position = file.seek(0, os.SEEK_END)
+        while position > 0:
+            start = max(position - _CHUNK_SIZE, 0)
+            file.seek(start)
+            index = file.read(position - start).rfind(b'\n')
+            if index >= 0:
+                position = start + index + 1
+                break
+            position = start
+        if position != end:
+            file.truncate(position)
+
+
+def repair_recording(path: str) -> None:
+    """
+    Repairs the tail of the recording interrupted by the crash,
+    so the new records can be appended after the complete ones
+    """
+
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return
+    with open(path, 'rb') as raw:
+        compressed = raw.read(2) == _GZIP_MAGIC
+    if not compressed:
+        _truncate_partial_line(path)
+        return
+    member = _unterminated_member(path)
+    if member is not None:
+        _repair_gzip_tail(path, member)
+
+
+class EventsRecorder:
+    """
+    Appends the raw 'avl_evts' responses with their receive time
+    to the JSON lines file, gzip compressed by default.
+    The tail of the file left by the crash is repaired on open
+    """
+
+    def __init__(self, path: str, *, compress: bool = True) -> None:
+        """
+        :param path: Recording file, the new records are appended to the existing ones
+        :param compress: Write gzip compressed file
+        """
+
+        self.path: str = path
+        self.compress: bool = compress
+        self._file: Optional[IO[bytes]] = None
+        self._pending: Optional[asyncio.Future] = None
+        self._records: int = 0
+        self._events: int = 0
+
+    def _open(self) -> IO[bytes]:
+        if self._file is None:
+            repair_recording(self.path)
+            # pylint: disable=consider-using-with
+            self._file = cast(IO[bytes], gzip.open(self.path, 'ab') if self.compress
+                              else open(self.path, 'ab'))
+        return self._file
+
+    def _write(self, line: bytes) -> None:
+        self._open().write(line)
+
+    async def _wait_pending(self) -> None:
+        """Waits for the write left in the executor by the cancelled record"""
+
+        if self._pending is not None:
+            # its error was raised to the record caller if it wasn't cancelled
+            with suppress(OSError):
+                await asyncio.shield(self._pending)
+            self._pending = None
+
+    async def record(self, response: Dict[str, Any]) -> None:
+        """
+        Appends the response, the file is written in the default executor,
+        the write started is completed even if the caller is cancelled
+        """
+
+        line = json.dumps({'t': time.time(), 'r': response}, ensure_ascii=False)
+        await self._wait_pending()
+        self._pending = asyncio.get_running_loop().run_in_executor(
+            None, self._write, line.encode() + b'\n'
+        )
+        await asyncio.shield(self._pending)
+        self._pending = None
+        self._records += 1
+        self._events += len(response.get('events') or ())
+
+    async def flush(self) -> None:
+        """Writes the buffered records to the file"""
+
+        await self._wait_pending()
+        if self._file is not None:
+            self._file.flush()
+
+    async def close(self) -> None:
+        """Waits for the pending record and closes the file, the next record opens it again"""
+
+        await self._wait_pending()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the recorded responses and events counters"""
+
+        return {
+            'records': self._records,
+            'events': self._events,
+        }
+
+
+class EventsReplay:  # pylint: disable=too-few-public-methods
+    """
+    Async iterator over the recorded 'avl_evts' responses,
+    keeping the intervals between them divided by 'speed'
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1) -> None:
+        """
+        :param path: Recording file
+        :param speed: Replay speed multiplier, None to replay as fast as possible
+        """
+
+        if speed is not None and speed <= 0:
+            raise ValueError("EventsReplay speed have to be > 0 or None")
+        self.path: str = path
+        self.speed: Optional[float] = speed
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._replay()
+
+    async def _replay(self) -> AsyncIterator[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        first: Optional[float] = None
+        started = loop.time()
+        for recorded, response in read_recording(self.path):
+            if self.speed is None:
+                # let the handlers run between the responses
+                await asyncio.sleep(0)
+            elif first is None:
+                first, started = recorded, loop.time()
+            else:
+                # scheduled from the start not to accumulate the drift
+                delay = started + (recorded - first) / self.speed - loop.time()
+                await asyncio.sleep(max(delay, 0))
+            yield response
+
+
+__all__ = (
+    'EventsRecorder',
+    'EventsReplay',
+    'read_recording',
+    'repair_recording',
+)
@@ -0,0 +1,123 @@
+"""Retry policy for the transient Wialon Remote API failures"""
+
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, FrozenSet, Iterable, Optional
+
+import aiohttp
+
+from aiowialon.exceptions import WialonError
+from aiowialon.logger import logger
+from aiowialon.utils.timeouts import remaining_time, request_timeout
+
+# Wialon error codes of the failures that can pass on the next attempt
+RETRYABLE_ERROR_CODES = frozenset({
+    5,  # Error performing request
+    9,  # Authorization server is unavailable
+    10,  # Reached limit of concurrent requests
+    1003,  # Only one request of given time is allowed at the moment
+})
+
+
+# pylint: disable=too-many-instance-attributes
+class RetryPolicy:
+    """
+    Retries the calls failed with transient errors with jittered exponential backoff.
+    Only the actions listed in 'actions' are retried, so the non-idempotent services
+    are never sent twice unless they are added to the list explicitly
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, attempts: int = 3, *,
+                 base_delay: float = 0.5,
+                 max_delay: float = 10,
+                 multiplier: float = 2,
+                 jitter: bool = True,
+                 deadline: Optional[float] = None,
+                 actions: Optional[Iterable[str]] = None,
+                 error_codes: Iterable[int] = RETRYABLE_ERROR_CODES) -> None:
+        """
+        :param attempts: Max attempts number including the first one
+        :param base_delay: Delay in seconds before the first retry
+        :param max_delay: Upper bound of the delay in seconds
+        :param multiplier: Delay multiplier for each next retry
+        :param jitter: Use random delay in range [0, delay] (full jitter)
+        :param deadline: Overall time budget in seconds for all the attempts of a call
+        :param actions: Actions allowed to be retried, defaults to Wialon.READ_ONLY_ACTIONS
+        :param error_codes: Wialon error codes considered as transient
+        """
+
+        if attempts < 1:
+            raise ValueError("RetryPolicy attempts have to be >= 1")
+        self.attempts: int = attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.multiplier: float = multiplier
+        self.jitter: bool = jitter
+        self.deadline: Optional[float] = deadline
+        self.actions: Optional[FrozenSet[str]] = frozenset(actions) if actions is not None else None
+        self.error_codes: FrozenSet[int] = frozenset(error_codes)
+        self.retries: int = 0
+
+    def is_retryable(self, err: BaseException) -> bool:
+        """Classifies the exception as transient"""
+
+        if isinstance(err, WialonError):
+            return err.code in self.error_codes
+        if isinstance(err, aiohttp.ClientResponseError):
+            return err.status >= 500
+        return isinstance(err, (asyncio.TimeoutError,
+                                aiohttp.ServerTimeoutError,
+                                aiohttp.ClientConnectionError))
+
+    def allows(self, action_name: str) -> bool:
+        """Checks if the action can be retried"""
+
+        return self.actions is not None and action_name in self.actions
+
+    def backoff(self, attempt: int) -> float:
+        """Returns the delay in seconds before the retry number 'attempt' (starting with 1)"""
+
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    async def call(self, action_name: str,
+                   factory: Callable[[], Awaitable[Any]],
+                   deadline: Optional[float] = None) -> Any:
+        """
+        Awaits the new call from factory until it succeeds,
+        fails with the fatal error or the attempts/deadline are exhausted,
+        the deadline limits the request timeout of each attempt too
+        :param deadline: Overrides the policy deadline for this call
+        """
+
+        if not self.allows(action_name):
+            return await factory()
+        if deadline is None:
+            deadline = self.deadline
+        # each attempt gets only the rest of the deadline as its request timeout
+        with request_timeout(deadline=deadline):
+            attempt = 1
+            while True:
+                try:
+                    return await factory()
+                except (WialonError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+                    if attempt >= self.attempts or not self.is_retryable(err):
+                        raise
+                    delay = self.backoff(attempt)
+                    remaining = remaining_time()
+                    if remaining is not None and delay >= remaining:
+                        raise
+                    logger.warning("Retrying '%s' in %.2fs, attempt %d/%d: %r",
+                                   action_name, delay, attempt + 1, self.attempts, err)
+                    self.retries += 1
+                    attempt += 1
+                    await asyncio.sleep(delay)
+
+
+__all__ = (
+    'RETRYABLE_ERROR_CODES',
+    'RetryPolicy',
+)
@@ -0,0 +1,129 @@
+"""Priority-aware scheduling of the requests in front of the rate limiter"""
+
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Deque, Dict, Iterator, Optional
+
+from aiowialon.utils.waiters import wait_admission
+
+
+class RequestPriority(IntEnum):
+    """Request priority classes, lower value is more urgent"""
+
+    REALTIME = 0  # AVL events polling
+    INTERACTIVE = 1  # default for the API calls
+    BULK = 2  # background jobs, exports, etc.
+
+
+DEFAULT_PRIORITY_WEIGHTS: Dict[RequestPriority, int] = {
+    RequestPriority.REALTIME: 16,
+    RequestPriority.INTERACTIVE: 4,
+    RequestPriority.BULK: 1,
+}
+
+current_priority: ContextVar[RequestPriority] = ContextVar(
+    'current_priority', default=RequestPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """
+    Context manager to set the priority of the requests made in its scope,
+    including the tasks created inside it
+    """
+
+    token = current_priority.set(RequestPriority(priority))
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class PriorityScheduler:
+    """
+    Admits the waiters by priority classes with smooth weighted round-robin,
+    so the lower classes still progress, but get the capacity left by the higher ones.
+    'capacity' is the number of waiters admitted at the same time
+    """
+
+    def __init__(self, weights: Optional[Dict[RequestPriority, int]] = None,
+                 capacity: int = 1) -> None:
+        if capacity < 1:
+            raise ValueError("PriorityScheduler capacity have to be >= 1")
+        self.weights: Dict[RequestPriority, int] = dict(DEFAULT_PRIORITY_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        if any(w < 1 for w in self.weights.values()):
+            raise ValueError("PriorityScheduler weights have to be >= 1")
+        self.capacity: int = capacity
+        self._active: int = 0
+        self._queues: Dict[RequestPriority, Deque[asyncio.Future]] = {
+            p: deque() for p in RequestPriority
+        }
+        self._current: Dict[RequestPriority, int] = {p: 0 for p in RequestPriority}
+
+    def qsize(self, priority: Optional[RequestPriority] = None) -> int:
+        """Number of waiters of the priority class, or of all classes"""
+
+        if priority is not None:
+            return len(self._queues[priority])
+        return sum(len(q) for q in self._queues.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the queues depth by priority class name"""
+
+        return {p.name.lower(): len(q) for p, q in self._queues.items()}
+
+    async def acquire(self, priority: Optional[RequestPriority] = None) -> None:
+        """Waits for admission"""
+
+        if priority is None:
+            priority = current_priority.get()
+        if self._active < self.capacity and not self.qsize():
+            self._active += 1
+            return
+        await wait_admission(self._queues[priority], self.release)
+
+    def release(self) -> None:
+        """Frees the admission slot"""
+
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._active < self.capacity:
+            priority = self._next_priority()
+            if priority is None:
+                return
+            future = self._queues[priority].popleft()
+            if future.done():
+                continue
+            self._active += 1
+            future.set_result(None)
+
+    def _next_priority(self) -> Optional[RequestPriority]:
+        """Smooth weighted round-robin over non-empty classes"""
+
+        candidates = [p for p, q in self._queues.items() if q]
+        if not candidates:
+            return None
+        total = 0
+        for p in candidates:
+            self._current[p] += self.weights[p]
+            total += self.weights[p]
+        best = max(candidates, key=lambda p: (self._current[p], -p))
+        self._current[best] -= total
+        return best
+
+
+__all__ = (
+    'RequestPriority',
+    'DEFAULT_PRIORITY_WEIGHTS',
+    'PriorityScheduler',
+    'current_priority',
+    'request_priority',
+)
@@ -0,0 +1,289 @@
+"""Registry of the Wialon Remote API actions callable as Wialon.<action_name>"""
+
+from typing import Dict, FrozenSet, Tuple
+
+# Action names by Wialon Remote API service, keep in sync with the stubs in api.pyi
+WIALON_SERVICES: Dict[str, Tuple[str, ...]] = {
+    'core': (
+        'core_logout',
+        'core_get_account_data',
+        'core_check_items_billing',
+        'core_check_accessors',
+        'core_create_user',
+        'core_create_resource',
+        'core_create_unit',
+        'core_create_unit_group',
+        'core_create_retranslator',
+        'core_create_route',
+        'core_search_item',
+        'core_search_items',
+        'core_update_data_flags',
+        'core_get_hw_types',
+        'core_get_hw_cmds',
+        'core_reset_password_request',
+        'core_reset_password_perform',
+        'core_batch',
+        'core_duplicate',
+        'core_create_auth_hash',
+        'core_use_auth_hash',
+        'core_check_unique',
+        'core_export_file',
+        'core_set_session_property',
+    ),
+    'item': (
+        'item_update_name',
+        'item_delete_item',
+        'item_update_custom_field',
+        'item_update_custom_property',
+        'item_update_admin_field',
+        'item_add_log_record',
+        'item_get_backup',
+        'item_list_backups',
+        'item_update_measure_units',
+        'item_update_ftp_property',
+        'item_update_profile_field',
+        'item_restore_icons',
+    ),
+    'user': (
+        'user_verify_auth',
+        'user_update_auth_params',
+        'user_update_item_access',
+        'user_get_items_access',
+        'user_update_hosts_mask',
+        'user_update_user_notification',
+        'user_update_password',
+        'user_send_sms',
+        'user_update_user_flags',
+        'user_update_locale',
+        'user_get_locale',
+        'user_get_dst_time',
+    ),
+    'resource': (
+        'resource_get_zone_data',
+        'resource_update_zone',
+        'resource_create_zone_by_track',
+        'resource_get_zones_by_point',
+        'resource_upload_zone_image',
+        'resource_update_zones_group',
+        'resource_get_job_data',
+        'resource_update_job',
+        'resource_get_notification_data',
+        'resource_update_notification',
+        'resource_update_driver',
+        'resource_upload_driver_image',
+        'resource_bind_unit_driver',
+        'resource_update_driver_units',
+        'resource_get_driver_bindings',
+        'resource_get_unit_drivers',
+        'resource_cleanup_driver_interval',
+        'resource_upload_tacho_file',
+        'resource_driver_operate',
+        'resource_driver_status',
+        'resource_update_drivers_group',
+        'resource_update_trailer',
+        'resource_upload_trailer_image',
+        'resource_bind_unit_trailer',
+        'resource_update_trailer_units',
+        'resource_get_trailer_bindings',
+        'resource_get_unit_trailers',
+        'resource_cleanup_trailer_interval',
+        'resource_update_trailers_group',
+        'resource_update_tag',
+        'resource_upload_tag_image',
+        'resource_bind_unit_tag',
+        'resource_update_tag_units',
+        'resource_update_tag_message',
+        'resource_get_tag_bindings',
+        'resource_update_tags_group',
+        'resource_update_email_template',
+        'resource_get_orders_notification',
+        'resource_update_orders_notification',
+    ),
+    'account': (
+        'account_create_account',
+        'account_delete_account',
+        'account_get_account_data',
+        'account_enable_account',
+        'account_get_billing_plans',
+        'account_list_change_accounts',
+        'account_update_billing_plan',
+        'account_update_plan',
+        'account_update_sub_plans',
+        'account_update_dealer_rights',
+        'account_update_billing_service',
+        'account_update_flags',
+        'account_do_payment',
+        'account_update_min_days',
+        'account_get_account_history',
+        'account_update_history_period',
+        'account_change_account',
+        'account_trash',
+    ),
+    'unit': (
+        'unit_add_video_packets',
+        'unit_update_video_status',
+        'unit_update_command_definition',
+        'unit_exec_cmd',
+        'unit_get_command_definition_data',
+        'unit_update_calc_flags',
+        'unit_update_eh_counter',
+        'unit_update_traffic_counter',
+        'unit_update_mileage_counter',
+        'unit_update_device_type',
+        'unit_update_image',
+        'unit_get_fuel_settings',
+        'unit_update_fuel_rates_params',
+        'unit_update_fuel_math_params',
+        'unit_update_fuel_level_params',
+        'unit_update_fuel_impulse_params',
+        'unit_update_fuel_calc_types',
+        'unit_get_accelerometers_calibration',
+        'unit_get_report_settings',
+        'unit_get_messages_filter',
+        'unit_get_drive_rank_settings',
+        'unit_get_trips',
+        'unit_get_video_settings',
+        'unit_get_vin_info',
+        'unit_update_hw_params',
+        'unit_update_phone',
+        'unit_registry_custom_event',
+        'unit_registry_fuel_filling_event',
+        'unit_registry_maintenance_event',
+        'unit_registry_status_event',
+        'unit_update_phone2',
+        'unit_update_unique_id2',
+        'unit_update_sensor',
+        'unit_calc_sensors',
+        'unit_calc_last_message',
+        'unit_update_service_interval',
+        'unit_update_video_autopay',
+        'unit_update_activity_settings',
+        'unit_get_trip_detector',
+        'unit_update_access_password',
+        'unit_set_active',
+        'unit_update_accelerometers_calibration',
+        'unit_update_drive_rank_settings',
+        'unit_update_report_settings',
+        'unit_update_messages_filter',
+        'unit_update_trip_detector',
+        'unit_update_video_settings',
+        'unit_upload_image',
+    ),
+    'unit_group': (
+        'unit_group_update_units',
+    ),
+    'retranslator': (
+        'retranslator_update_units',
+        'retranslator_update_operating',
+        'retranslator_get_stats',
+        'retranslator_update_config',
+    ),
+    'route': (
+        'route_route_update_round',
+        'route_get_round_data',
+        'route_get_all_rounds',
+        'route_get_schedule_time',
+        'route_load_rounds',
+        'route_update_config',
+        'route_update_checkpoints',
+        'route_update_schedule',
+        'route_optimize',
+    ),
+    'messages': (
+        'messages_unload',
+        'messages_delete_message',
+        'messages_get_messages',
+        'messages_get_message_file',
+        'messages_get_packed_messages',
+        'messages_load_last',
+        'messages_load_interval',
+    ),
+    'report': (
+        'report_cleanup_result',
+        'report_exec_report',
+        'report_export_result',
+        'report_get_result_chart',
+        'report_render_json',
+        'report_hittest_chart',
+        'report_get_report_tables',
+        'report_get_result_map',
+        'report_get_result_subrows',
+        'report_get_result_photo',
+        'report_get_report_status',
+        'report_select_result_rows',
+        'report_get_result_rows',
+        'report_get_report_data',
+        'report_get_result_video',
+        'report_update_report',
+    ),
+    'exchange': (
+        'exchange_export_zones',
+        'exchange_export_messages',
+        'exchange_export_json',
+        'exchange_import_json',
+        'exchange_import_zones_save',
+        'exchange_import_messages',
+        'exchange_import_pois_save',
+        'exchange_import_zones_read',
+        'exchange_import_pois_read',
+    ),
+    'render': (
+        'render_enable_layer',
+        'render_create_poi_layer',
+        'render_create_zones_layer',
+        'render_create_messages_layer',
+        'render_get_messages',
+        'render_delete_message',
+        'render_remove_layer',
+        'render_remove_all_layers',
+        'render_set_locale',
+        'render_calculate_polygon',
+        'render_calculate_polyline',
+    ),
+    'token': (
+        'token_update',
+        'token_list',
+        'token_login',
+    ),
+    'file': (
+        'file_list',
+        'file_get',
+        'file_put',
+        'file_rm',
+        'file_read',
+        'file_write',
+        'file_library',
+        'file_mkdir',
+        'file_type_library',
+    ),
+    'events': (
+        'events_update_units',
+        'events_check_updates',
+        'events_load',
+        'events_get',
+        'events_unload',
+    ),
+    'order': (
+        'order_update',
+        'order_attach',
+        'order_list_attachments',
+        'order_detach',
+        'order_get_attachment',
+        'order_complete_from_history',
+        'order_optimize',
+        'order_route_update',
+    ),
+    'apps': (
+        'apps_list',
+    ),
+}
+
+WIALON_ACTIONS: FrozenSet[str] = frozenset(
+    action for actions in WIALON_SERVICES.values() for action in actions
+)
+
+
+__all__ = (
+    'WIALON_SERVICES',
+    'WIALON_ACTIONS',
+)
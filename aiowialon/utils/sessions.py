@@ -0,0 +1,183 @@
+"""Pool of Wialon sessions to spread the calls over per-session server limits"""
+
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Literal, Optional
+
+SessionPolicy = Literal['least_loaded', 'sticky']
+
+
+class SessionAffinity:  # pylint: disable=too-few-public-methods
+    """Holds the session chosen for the calls of the 'session_affinity' scope"""
+
+    __slots__ = ('sid',)
+
+    def __init__(self) -> None:
+        self.sid: Optional[str] = None
+
+
+current_affinity: ContextVar[Optional[SessionAffinity]] = ContextVar(
+    'current_affinity', default=None
+)
+
+
+@contextmanager
+def session_affinity() -> Iterator[None]:
+    """
+    Context manager to send all the calls made in its scope,
+    including the tasks created inside it, with the same session.
+    Required for the flows keeping state in the session (reports, messages loading, render)
+    """
+
+    if current_affinity.get() is not None:
+        yield
+        return
+    token = current_affinity.set(SessionAffinity())
+    try:
+        yield
+    finally:
+        current_affinity.reset(token)
+
+
+# pylint: disable=too-many-instance-attributes
+class SessionPool:
+    """
+    Keeps the additional Wialon sessions opened with the primary one
+    and chooses the session for each call.
+    The primary session is used for polling and the calls changing the session state
+    """
+
+    def __init__(self, size: int = 2, *,
+                 policy: SessionPolicy = 'least_loaded',
+                 duplicate: bool = True) -> None:
+        """
+        :param size: Number of sessions including the primary one
+        :param policy: 'least_loaded' - the session with the fewest calls in flight,
+                       'sticky' - the calls of the same item always use the same session
+        :param duplicate: Open the sessions with 'core/duplicate' of the primary one,
+                          otherwise login with the token again
+        """
+
+        if size < 1:
+            raise ValueError("SessionPool size have to be >= 1")
+        if policy not in ('least_loaded', 'sticky'):
+            raise ValueError(f"Unknown SessionPool policy: {policy}")
+        self.size: int = size
+        self.policy: SessionPolicy = policy
+        self.duplicate: bool = duplicate
+        self._primary: Optional[str] = None
+        self._sessions: List[str] = []
+        self._inflight: Dict[str, int] = {}
+        self._requests: Dict[str, int] = {}
+        self._round_robin: Iterator[int] = itertools.count()
+
+    @property
+    def primary(self) -> Optional[str]:
+        """Primary session id"""
+
+        return self._primary
+
+    @property
+    def sessions(self) -> List[str]:
+        """All the session ids, the primary one is the first"""
+
+        return list(self._sessions)
+
+    @property
+    def extra(self) -> List[str]:
+        """Additional session ids"""
+
+        return self._sessions[1:]
+
+    def open(self, primary: str) -> None:
+        """Sets the new primary session, forgets the previous sessions"""
+
+        self.clear()
+        self._primary = primary
+        self.add(primary)
+
+    def add(self, sid: str) -> None:
+        """Adds the opened session to the pool"""
+
+        if sid in self._inflight:
+            return
+        self._sessions.append(sid)
+        self._inflight[sid] = 0
+        self._requests[sid] = 0
+
+    def remove(self, sid: str) -> None:
+        """Removes the session from the pool"""
+
+        if sid in self._inflight:
+            self._sessions.remove(sid)
+            del self._inflight[sid]
+            del self._requests[sid]
+        if sid == self._primary:
+            self._primary = None
+
+    def clear(self) -> None:
+        """Forgets all the sessions"""
+
+        self._primary = None
+        self._sessions.clear()
+        self._inflight.clear()
+        self._requests.clear()
+
+    def select(self, item_id: Optional[int] = None, primary: bool = False) -> Optional[str]:
+        """
+        Chooses the session for the call
+        :param item_id: Item id of the call for the 'sticky' policy
+        :param primary: The call have to be sent with the primary session
+        """
+
+        if primary or len(self._sessions) < 2:
+            return self._primary
+        affinity = current_affinity.get()
+        if affinity is not None and affinity.sid in self._inflight:
+            return affinity.sid
+        if self.policy == 'sticky' and item_id is not None:
+            sid = self._sessions[item_id % len(self._sessions)]
+        else:
+            # rotate the start point, so the idle sessions are used in turn
+            offset = next(self._round_robin) % len(self._sessions)
+            candidates = self._sessions[offset:] + self._sessions[:offset]
+            sid = min(candidates, key=self._inflight.__getitem__)
+        if affinity is not None:
+            affinity.sid = sid
+        return sid
+
+    @contextmanager
+    def session(self, item_id: Optional[int] = None,
+                primary: bool = False) -> Iterator[Optional[str]]:
+        """Chooses the session and counts the call in flight for its scope"""
+
+        sid = self.select(item_id, primary)
+        if sid not in self._inflight:
+            yield sid
+            return
+        self._inflight[sid] += 1
+        self._requests[sid] += 1
+        try:
+            yield sid
+        finally:
+            if sid in self._inflight:
+                self._inflight[sid] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns calls in flight and total calls by session"""
+
+        return {
+            'sessions': len(self._sessions),
+            'inflight': list(self._inflight.values()),
+            'requests': list(self._requests.values()),
+        }
+
+
+__all__ = (
+    'SessionPolicy',
+    'SessionAffinity',
+    'SessionPool',
+    'current_affinity',
+    'session_affinity',
+)
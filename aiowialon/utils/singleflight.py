@@ -0,0 +1,47 @@
+"""Coalescing of identical concurrent calls to a single underlying request"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Shares one in-flight awaitable between all concurrent callers with the same key.
+    All the waiters get the same result object or the same exception,
+    the key is released as soon as the call is done
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def inflight(self) -> int:
+        """Number of unique calls in flight"""
+
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits the call with the key if it's already in flight,
+        otherwise starts the new one with the factory
+        """
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._release(key, f))
+        # shield, so the cancellation of one waiter doesn't cancel the others
+        return await asyncio.shield(future)
+
+    def _release(self, key: Hashable, future: asyncio.Future) -> None:
+        """Forgets the finished call"""
+
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # mark the exception as retrieved if all the waiters were cancelled
+            future.exception()
+
+
+__all__ = ['SingleFlight']
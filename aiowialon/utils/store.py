@@ -0,0 +1,181 @@
+"""Local copy of the subscribed Wialon items kept current by AVL events"""
+
+from collections import defaultdict
+from typing import (Any, Callable, DefaultDict, Dict, Hashable, Iterable, Iterator, List,
+                    Literal, Optional, Set)
+
+from aiowialon.logger import logger
+
+ItemChange = Literal['seed', 'update', 'message', 'delete']
+ItemChangeCallback = Callable[[int, ItemChange, Dict[str, Any]], Any]
+
+
+class ItemStore:
+    """
+    Keeps the data of the items subscribed with 'core/update_data_flags',
+    seeded from its response and updated by 'avl_evts' events:
+    'u' - the changed properties are merged into the item,
+    'm' - the message is set as the item 'lmsg' and its position as the item 'pos',
+    'd' - the item is removed.
+    The items are the same dicts as in the responses, don't modify them
+    """
+
+    def __init__(self, index: Iterable[str] = ()) -> None:
+        """
+        :param index: Item properties to look the items up by, e.g. ('cls', 'nm')
+        """
+
+        self._items: Dict[int, Dict[str, Any]] = {}
+        self._indexes: Dict[str, DefaultDict[Hashable, Set[int]]] = {
+            prop: defaultdict(set) for prop in index
+        }
+        self._callbacks: List[ItemChangeCallback] = []
+        self._events: int = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._items
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._items)
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Returns the item data by id"""
+
+        return self._items.get(item_id)
+
+    def find(self, **props: Any) -> List[Dict[str, Any]]:
+        """
+        Returns the items having all the property values,
+        the indexed properties are looked up, the other ones are checked one by one
+
+        >>> store.find(cls=2, nm='Truck 1')
+        """
+
+        ids: Optional[Set[int]] = None
+        for prop, value in props.items():
+            index = self._indexes.get(prop)
+            if index is None:
+                continue
+            found = index.get(value, set()) if isinstance(value, Hashable) else set()
+            ids = found if ids is None else ids & found
+        items = (self._items.values() if ids is None
+                 else [self._items[item_id] for item_id in ids])
+        return [item for item in items
+                if all(item.get(prop) == value for prop, value in props.items())]
+
+    def on_change(self, callback: ItemChangeCallback) -> ItemChangeCallback:
+        """
+        Decorator to register the callback of the item changes,
+        it's called with the item id, the change kind and the item data
+
+        >>> @store.on_change
+        >>> def changed(item_id: int, change: ItemChange, item: Dict[str, Any]):
+        >>>     print(item_id, change, item.get('pos'))
+        """
+
+        self._callbacks.append(callback)
+        return callback
+
+    def remove_callback(self, callback: ItemChangeCallback) -> None:
+        """Removes the change callback"""
+
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def seed(self, response: Any) -> None:
+        """Applies the 'core/update_data_flags' response"""
+
+        if not isinstance(response, list):
+            return
+        for entry in response:
+            if not isinstance(entry, dict) or 'i' not in entry:
+                continue
+            if entry.get('d') is None:
+                # the item is unsubscribed
+                self._delete(entry['i'])
+            else:
+                self._merge(entry['i'], entry['d'], 'seed')
+
+    def apply(self, event: Any) -> None:
+        """Applies the AVL event to the item"""
+
+        data = event.data
+        if data.t == 'd':
+            self._delete(data.i)
+            return
+        if data.i not in self._items:
+            return
+        self._events += 1
+        if data.t == 'u':
+            self._merge(data.i, data.d, 'update')
+        elif data.t == 'm':
+            changes: Dict[str, Any] = {'lmsg': data.d}
+            pos = data.d.get('pos')
+            if pos:
+                changes['pos'] = {**pos, 't': data.d.get('t')}
+            self._merge(data.i, changes, 'message')
+
+    def clear(self) -> None:
+        """Forgets all the items"""
+
+        self._items.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    def _merge(self, item_id: int, changes: Dict[str, Any], change: ItemChange) -> None:
+        item = self._items.get(item_id)
+        if item is None:
+            item = self._items[item_id] = {}
+        for prop, index in self._indexes.items():
+            if prop in changes:
+                self._unindex(index, item.get(prop), item_id)
+        item.update(changes)
+        for prop, index in self._indexes.items():
+            if prop in changes and isinstance(item[prop], Hashable):
+                index[item[prop]].add(item_id)
+        self._notify(item_id, change, item)
+
+    def _delete(self, item_id: int) -> None:
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return
+        for prop, index in self._indexes.items():
+            self._unindex(index, item.get(prop), item_id)
+        self._notify(item_id, 'delete', item)
+
+    @staticmethod
+    def _unindex(index: DefaultDict[Hashable, Set[int]], value: Any, item_id: int) -> None:
+        if not isinstance(value, Hashable):
+            return
+        ids = index.get(value)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del index[value]
+
+    def _notify(self, item_id: int, change: ItemChange, item: Dict[str, Any]) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(item_id, change, item)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # the failed callback doesn't stop the events processing
+                logger.exception(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the items number and the applied events counter"""
+
+        return {
+            'items': len(self._items),
+            'events': self._events,
+            'indexes': {prop: len(index) for prop, index in self._indexes.items()},
+        }
+
+
+__all__ = (
+    'ItemChange',
+    'ItemChangeCallback',
+    'ItemStore',
+)
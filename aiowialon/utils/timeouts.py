@@ -0,0 +1,78 @@
+"""Per-call request timeouts and deadlines propagated with context variables"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+current_timeout: ContextVar[Optional[float]] = ContextVar('current_timeout', default=None)
+current_deadline: ContextVar[Optional[float]] = ContextVar('current_deadline', default=None)
+
+
+@contextmanager
+def request_timeout(timeout: Optional[float] = None,
+                    deadline: Optional[float] = None) -> Iterator[None]:
+    """
+    Context manager to set the timeouts of the requests made in its scope,
+    including the tasks created inside it. Doesn't affect concurrent calls
+    :param timeout: Timeout in seconds for each request
+    :param deadline: Time budget in seconds for all the requests (and retries) in the scope,
+                     nested scopes can't extend the outer deadline
+    """
+
+    if timeout is not None and timeout <= 0:
+        raise ValueError("Request timeout have to be > 0")
+    expires_at = current_deadline.get()
+    if deadline is not None:
+        own = time.monotonic() + deadline
+        expires_at = own if expires_at is None else min(expires_at, own)
+    timeout_token = current_timeout.set(timeout if timeout is not None else current_timeout.get())
+    deadline_token = current_deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        current_deadline.reset(deadline_token)
+        current_timeout.reset(timeout_token)
+
+
+def has_custom_timeout() -> bool:
+    """Checks if timeout or deadline is set for the current context"""
+
+    return current_timeout.get() is not None or current_deadline.get() is not None
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left till the current deadline or None if it's not set"""
+
+    expires_at = current_deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def effective_timeout(default: Optional[float]) -> Optional[float]:
+    """
+    Returns timeout for the next request in the current context,
+    raises asyncio.TimeoutError if the deadline is already exceeded
+    """
+
+    timeout = current_timeout.get()
+    if timeout is None:
+        timeout = default
+    remaining = remaining_time()
+    if remaining is not None:
+        if remaining <= 0:
+            raise asyncio.TimeoutError("Request deadline exceeded")
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    return timeout
+
+
+__all__ = (
+    'current_timeout',
+    'current_deadline',
+    'request_timeout',
+    'has_custom_timeout',
+    'remaining_time',
+    'effective_timeout',
+)
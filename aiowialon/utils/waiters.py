@@ -0,0 +1,27 @@
+"""Queues of the waiters admitted by the limiters"""
+
+import asyncio
+from typing import Callable, Deque
+
+
+async def wait_admission(waiters: Deque[asyncio.Future], release: Callable[[], None]) -> None:
+    """
+    Appends the future to the waiters and waits until the limiter admits it
+    :param release: Called if the waiter is cancelled right after the admission,
+                    to pass the slot taken for it to the next waiter
+    """
+
+    future = asyncio.get_running_loop().create_future()
+    waiters.append(future)
+    try:
+        await future
+    except asyncio.CancelledError:
+        if future.done() and not future.cancelled():
+            # admitted right before the cancellation
+            release()
+        elif future in waiters:
+            waiters.remove(future)
+        raise
+
+
+__all__ = ['wait_admission']
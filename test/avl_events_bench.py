@@ -0,0 +1,113 @@
+"""
+Benchmark of the 'avl_evts' response parsing:
+frozen dataclasses events vs lazily decoded AvlEvent
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Union
+
+# runs from the source tree without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiowialon import AvlEvent, AvlEventBatch, AvlEventType
+
+N = 20000
+
+
+@dataclass(frozen=True)
+class DataclassEventData:
+    """Previous AvlEventData implementation"""
+
+    i: int
+    t: AvlEventType
+    d: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not isinstance(self.t, AvlEventType) and isinstance(self.t, str):
+            object.__setattr__(self, 't', AvlEventType(self.t))
+        else:
+            raise TypeError(f"AvlEventData.t has be a type of {AvlEventType}")
+
+
+@dataclass(frozen=True)
+class DataclassEvent:
+    """Previous AvlEvent implementation"""
+
+    tm: Union[int, None]
+    data: DataclassEventData
+
+    def __post_init__(self):
+        if not isinstance(self.data, DataclassEventData):
+            object.__setattr__(self, 'data', DataclassEventData(**self.data))
+
+
+def response() -> Dict[str, Any]:
+    events: List[Dict[str, Any]] = [
+        {'i': i % 5000, 't': 'm', 'd': {'tp': 'ud', 't': 1700000000 + i, 'f': 1,
+                                        'pos': {'x': 30.5, 'y': 50.4, 'z': 0, 's': 60, 'c': 90},
+                                        'p': {'pwr_ext': 12.4, 'gsm': 3}}}
+        for i in range(N)
+    ]
+    return {'tm': 1700000000, 'events': events}
+
+
+def dataclasses_parse(avl_events):
+    tm = avl_events.get('tm', None)
+    return [DataclassEvent(tm, e) for e in avl_events['events']]
+
+
+def list_parse(avl_events):
+    return AvlEvent.parse_avl_events_response(avl_events)
+
+
+def batch_parse(avl_events):
+    return list(AvlEventBatch(avl_events))
+
+
+def batch_route(avl_events):
+    # the router reads just the item and type of each event
+    return [(event.data.i, event.data.t) for event in AvlEventBatch(avl_events)]
+
+
+def dataclasses_route(avl_events):
+    return [(event.data.i, event.data.t) for event in dataclasses_parse(avl_events)]
+
+
+def batch_dispatch(avl_events):
+    # the item store, the handlers and a stream read the same events
+    batch = AvlEventBatch(avl_events)
+    for _ in range(3):
+        for event in batch:
+            _ = event.data.i, event.data.t
+    return batch
+
+
+def dataclasses_dispatch(avl_events):
+    events = dataclasses_parse(avl_events)
+    for _ in range(3):
+        for event in events:
+            _ = event.data.i, event.data.t
+    return events
+
+
+def main():
+    avl_events = response()
+    for bench in (dataclasses_parse, list_parse, batch_parse, dataclasses_route, batch_route,
+                  dataclasses_dispatch, batch_dispatch):
+        start = time.perf_counter()
+        for _ in range(10):
+            bench(avl_events)
+        per_event = (time.perf_counter() - start) / (10 * N) * 1e9
+        tracemalloc.start()
+        events = bench(avl_events)
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del events
+        print(f"{bench.__name__}: {per_event:.0f} ns, {allocated / N:.0f} bytes per event")
+
+
+main()
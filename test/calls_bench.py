@@ -0,0 +1,46 @@
+"""
+Benchmark of the batch preparation overhead:
+'Wialon.call()' coroutines vs lightweight WialonCall objects
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# runs from the source tree without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiowialon import Wialon, WialonCall
+
+N = 10000
+
+
+class OfflineWialon(Wialon):
+    """Returns the prepared batch actions instead of sending them"""
+
+    async def _send_batch(self, actions, flags_):
+        return actions
+
+
+async def bench_coroutines(wialon):
+    calls = [wialon.core_search_item(id=i, flags=1) for i in range(N)]
+    return await wialon.batch(*calls, chunk_size=N, chunk_bytes=2 ** 30)
+
+
+async def bench_wialon_calls(wialon):
+    calls = [WialonCall('core_search_item', {'id': i, 'flags': 1}) for i in range(N)]
+    return await wialon.batch(*calls, chunk_size=N, chunk_bytes=2 ** 30)
+
+
+async def main():
+    wialon = OfflineWialon()
+    for bench in (bench_coroutines, bench_wialon_calls):
+        start = time.perf_counter()
+        for _ in range(10):
+            await bench(wialon)
+        per_call = (time.perf_counter() - start) / (10 * N) * 1e6
+        print(f"{bench.__name__}: {per_call:.2f} us per call")
+
+
+asyncio.run(main())
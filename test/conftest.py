@@ -0,0 +1,95 @@
+"""Fake Wialon Remote API server for the tests"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+from aiohttp import web
+
+from aiowialon import Wialon
+
+FakeHandler = Callable[[Dict[str, Any], Optional[str]], Any]
+
+
+class FakeWialon:
+    """
+    Local server answering the 'ajax.html' calls with the handlers registered by svc,
+    the not registered services echo their params, 'avl_evts' returns the queued events
+    """
+
+    def __init__(self) -> None:
+        self.handlers: Dict[str, FakeHandler] = {}
+        self.calls: List[Tuple[str, Dict[str, Any], Optional[str]]] = []
+        self.events: List[Dict[str, Any]] = []
+        self.delay: float = 0
+        self.sid: str = 'sid-1'
+        self.user_id: int = 1
+        self.port: int = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    async def __aenter__(self) -> 'FakeWialon':
+        app = web.Application()
+        app.router.add_post('/wialon/ajax.html', self._ajax)
+        app.router.add_post('/avl_evts', self._avl_evts)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def client(self, **kwargs: Any) -> Wialon:
+        """Returns the client of the server"""
+
+        return Wialon(scheme='http', host='127.0.0.1', port=self.port, token='token', **kwargs)
+
+    def svcs(self) -> List[str]:
+        """Returns the services of the received calls in order"""
+
+        return [svc for svc, _, _ in self.calls]
+
+    def answer(self, svc: str, params: Dict[str, Any], sid: Optional[str]) -> Any:
+        """Returns the response of the call"""
+
+        if svc in self.handlers:
+            return self.handlers[svc](params, sid)
+        if svc == 'token/login':
+            return {'eid': self.sid, 'user': {'id': self.user_id}}
+        if svc == 'core/batch':
+            results = []
+            for action in params['params']:
+                self.calls.append((action['svc'], action['params'], sid))
+                results.append(self.answer(action['svc'], action['params'], sid))
+            return results
+        return {'svc': svc, 'params': params}
+
+    async def _ajax(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        svc = str(data['svc'])
+        params = json.loads(str(data.get('params', '{}')))
+        sid = data.get('sid')
+        self.calls.append((svc, params, None if sid is None else str(sid)))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._json(self.answer(svc, params, None if sid is None else str(sid)))
+
+    async def _avl_evts(self, _: web.Request) -> web.Response:
+        events, self.events = self.events, []
+        return self._json({'tm': 1, 'events': events})
+
+    @staticmethod
+    def _json(data: Any) -> web.Response:
+        # the exact content type expected by the validator
+        return web.Response(body=json.dumps(data), content_type='application/json')
+
+
+@pytest.fixture
+def fake() -> FakeWialon:
+    """Not started fake server, start it with 'async with' inside the test loop"""
+
+    return FakeWialon()
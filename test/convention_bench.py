@@ -0,0 +1,97 @@
+"""
+Check and benchmark of the params preparation:
+the previous recursive 'prepare_action_params' vs the iterative one
+"""
+
+import os
+import random
+import sys
+import time
+from typing import Any, Dict
+
+# runs from the source tree without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiowialon.utils.convention import prepare_action_params
+
+NAMES = ('id', 'itemId', 'ItemId', 'from_', '_to', 'flags', 'Spec', 'data_', 'mode')
+
+
+def recursive_prepare_action_params(params: dict) -> dict:
+    """Previous implementation"""
+
+    if not isinstance(params, dict):
+        return params
+
+    new_params: Dict[str, Any] = {}
+    for k, v in params.items():
+        new_key = k.strip('_')
+        new_key = new_key[:1].lower() + new_key[1:] if new_key else ''
+        if isinstance(v, dict):
+            new_params[new_key] = recursive_prepare_action_params(v)
+        elif isinstance(v, list):
+            new_params[new_key] = [recursive_prepare_action_params(item)
+                                   if isinstance(item, dict)
+                                   else item for item in v]
+        else:
+            new_params[new_key] = v
+    return new_params
+
+
+def random_params(rnd: random.Random, depth: int, shared: list) -> Any:
+    kind = rnd.random()
+    if depth <= 0 or kind < 0.3:
+        return rnd.choice((1, 'a', None, 2.5, True))
+    if kind < 0.4 and shared:
+        # the same object referenced from different places, not a cycle
+        return rnd.choice(shared)
+    if kind < 0.7:
+        node: Any = {rnd.choice(NAMES): random_params(rnd, depth - 1, shared)
+                     for _ in range(rnd.randint(0, 4))}
+    else:
+        node = [random_params(rnd, depth - 1, shared) for _ in range(rnd.randint(0, 4))]
+    if rnd.random() < 0.3:
+        shared.append(node)
+    return node
+
+
+def check() -> None:
+    shared_dict = {'A': {'B': 1}}
+    cases = [
+        {'a': shared_dict, 'b': {'c': shared_dict}},
+        {'a': [shared_dict], 'b': [{'c': [shared_dict]}], 'c': shared_dict},
+    ]
+    rnd = random.Random(0)
+    for _ in range(5000):
+        cases.append({rnd.choice(NAMES): random_params(rnd, 5, []) for _ in range(3)})
+    for params in cases:
+        assert prepare_action_params(params) == recursive_prepare_action_params(params), params
+
+    circular: Dict[str, Any] = {'a': 1}
+    circular['self_'] = [circular]
+    try:
+        prepare_action_params({'x': circular})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Circular reference is not detected")
+    print(f"{len(cases)} params checked")
+
+
+def bench() -> None:
+    spec = {'spec': [{'itemsType': 'avl_unit', 'propName': 'sys_name', 'propValueMask': '*',
+                      'sortType': 'sys_name', 'or_logic': False} for _ in range(100)],
+            'force': 1, 'flags_': 1, 'from_': 0, 'to': 0}
+    scalars = {'items': list(range(10000))}
+    small = {'id': 1, 'flags': 1}
+    for name, params in (('nested spec', spec), ('10k scalars list', scalars), ('small', small)):
+        for func in (recursive_prepare_action_params, prepare_action_params):
+            start = time.perf_counter()
+            for _ in range(1000):
+                func(params)
+            per_call = (time.perf_counter() - start) / 1000 * 1e6
+            print(f"{name}, {func.__name__}: {per_call:.1f} us")
+
+
+check()
+bench()
@@ -0,0 +1,53 @@
+import dataclasses
+import pickle
+
+import pytest
+
+from aiowialon import AvlEvent, AvlEventBatch, AvlEventType
+from aiowialon.types.avl_events import AvlEventData
+
+RESPONSE = {'tm': 100, 'events': [
+    {'i': 1, 't': 'm', 'd': {'pos': {'x': 1}}},
+    {'i': 2, 't': 'u', 'd': {'nm': 'Truck'}},
+    {'i': 1, 't': 'd'},
+]}
+
+
+def test_event_data_is_dataclass():
+    data = AvlEventData(1, 'm', {'a': 1})
+    assert data.t is AvlEventType.MESSAGE
+    assert dataclasses.asdict(data) == {'i': 1, 't': 'm', 'd': {'a': 1}}
+    assert [f.name for f in dataclasses.fields(data)] == ['i', 't', 'd']
+    assert dataclasses.replace(data, i=2) == AvlEventData(2, 'm', {'a': 1})
+    assert data != (1, 'm', {'a': 1})
+    assert AvlEventData(1, 'u').d == {}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        data.i = 2  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        AvlEventData(1, 1)  # type: ignore[arg-type]
+
+
+def test_event_is_lazy_dataclass():
+    event = AvlEvent(100, RESPONSE['events'][0])
+    assert event == AvlEvent(100, AvlEventData(1, 'm', {'pos': {'x': 1}}))
+    assert event.data is event.data
+    assert dataclasses.asdict(event) == {'tm': 100, 'data': {'i': 1, 't': 'm',
+                                                             'd': {'pos': {'x': 1}}}}
+    assert dataclasses.replace(event, tm=101).tm == 101
+    assert pickle.loads(pickle.dumps(event)) == event
+    assert not hasattr(event, 'missing')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        event.tm = 1  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        AvlEvent(100, [1, 'm'])  # type: ignore[arg-type]
+
+
+def test_batch_decodes_events_once():
+    batch = AvlEventBatch(RESPONSE)
+    assert len(batch) == 3 and batch.items() == {1, 2}
+    events = list(batch)
+    assert all(a is b for a, b in zip(events, batch))
+    assert batch[-1] is events[-1] and batch[1:] == events[1:]
+    assert [event.data.t for event in batch] == [AvlEventType.MESSAGE, AvlEventType.UPDATE,
+                                                 AvlEventType.DELETE]
+    assert AvlEvent.parse_avl_events_response(RESPONSE) == events
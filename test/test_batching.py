@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from aiowialon import Wialon, WialonCall, WialonError
+from aiowialon.types.flags import BatchFlag
+from aiowialon.utils.batching import CallBatcher, split_batch
+from aiowialon.utils.scheduler import RequestPriority, current_priority
+
+
+def test_auto_batch_demux(fake):
+    async def main():
+        fake.handlers['core/search_item'] = lambda params, sid: {'item': {'id': params['id']}}
+        async with fake:
+            wialon = fake.client(auto_batch=True, auto_batch_delay=0.01)
+            await wialon.login()
+            results = await asyncio.gather(*[wialon.core_search_item(id=i, flags=1)
+                                             for i in range(5)])
+            await wialon.close()
+        assert [r['item']['id'] for r in results] == list(range(5))
+        assert fake.svcs() == ['token/login', 'core/batch'] + ['core/search_item'] * 5
+
+    asyncio.run(main())
+
+
+def test_auto_batch_per_call_errors(fake):
+    async def main():
+        fake.handlers['core/search_item'] = (
+            lambda params, sid: {'error': 7} if params['id'] % 2 else {'item': params['id']}
+        )
+        async with fake:
+            wialon = fake.client(auto_batch=True, auto_batch_delay=0.01)
+            await wialon.login()
+            results = await asyncio.gather(*[wialon.core_search_item(id=i, flags=1)
+                                             for i in range(4)], return_exceptions=True)
+            await wialon.close()
+        assert results[0] == {'item': 0} and results[2] == {'item': 2}
+        for result in results[1::2]:
+            assert isinstance(result, WialonError) and result.code == 7
+
+    asyncio.run(main())
+
+
+def test_auto_batch_skips_custom_priority(fake):
+    async def main():
+        async with fake:
+            wialon = fake.client(auto_batch=True, auto_batch_delay=0.01)
+            await wialon.login()
+            with Wialon.request_priority(RequestPriority.BULK):
+                await asyncio.gather(*[wialon.core_search_item(id=i, flags=1)
+                                       for i in range(3)])
+            await wialon.close()
+        assert 'core/batch' not in fake.svcs()
+
+    asyncio.run(main())
+
+
+def test_batcher_resets_submitter_context():
+    seen = []
+
+    async def send(items):
+        seen.append(current_priority.get())
+        return items
+
+    async def main():
+        batcher = CallBatcher(send, delay=0.01)
+        with Wialon.request_priority(RequestPriority.BULK):
+            assert await batcher.submit(1) == 1
+
+    asyncio.run(main())
+    assert seen == [RequestPriority.INTERACTIVE]
+
+
+def test_split_batch():
+    actions = [{'svc': 'a', 'params': {'n': i}} for i in range(5)]
+    assert [len(chunk) for chunk in split_batch(actions, 2, 10_000)] == [2, 2, 1]
+    assert [len(chunk) for chunk in split_batch(actions, 10, 70)] == [2, 2, 1]
+    with pytest.raises(ValueError):
+        split_batch(actions, 0, 1)
+
+
+def test_batch_not_chunked_by_default(fake):
+    async def main():
+        async with fake:
+            wialon = fake.client()
+            await wialon.login()
+            results = await wialon.batch(*[WialonCall('core_search_item', {'id': i})
+                                           for i in range(150)])
+            await wialon.close()
+        assert [r['params']['id'] for r in results] == list(range(150))
+        assert fake.svcs().count('core/batch') == 1
+
+    asyncio.run(main())
+
+
+def test_batch_chunks_keep_order(fake):
+    async def main():
+        async with fake:
+            wialon = fake.client()
+            await wialon.login()
+            results = await wialon.batch(*[WialonCall('core_search_item', {'id': i})
+                                           for i in range(25)], chunk_size=10)
+            await wialon.close()
+        assert [r['params']['id'] for r in results] == list(range(25))
+        assert fake.svcs().count('core/batch') == 3
+
+    asyncio.run(main())
+
+
+def test_batch_chunks_under_session_lock(fake):
+    async def main():
+        async with fake:
+            wialon = fake.client()
+            await wialon.login()
+
+            @wialon.session_lock
+            async def locked():
+                return await wialon.batch(*[WialonCall('core_search_item', {'id': i})
+                                            for i in range(150)], chunk_size=100)
+
+            results = await asyncio.wait_for(locked(), 5)
+            await wialon.close()
+        assert len(results) == 150
+        assert fake.svcs().count('core/batch') == 2
+
+    asyncio.run(main())
+
+
+def test_batch_chunks_stop_on_error(fake):
+    async def main():
+        fake.handlers['core/search_item'] = (
+            lambda params, sid: {'error': 7} if params['id'] == 3 else {'item': params['id']}
+        )
+        async with fake:
+            wialon = fake.client()
+            await wialon.login()
+            with pytest.raises(WialonError):
+                await wialon.batch(*[WialonCall('core_search_item', {'id': i})
+                                     for i in range(10)],
+                                   flags_=BatchFlag.STOP_ON_ERROR, chunk_size=2)
+            await wialon.close()
+        assert fake.svcs().count('core/batch') == 2
+
+    asyncio.run(main())
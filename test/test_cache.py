@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from aiowialon.utils.cache import MemoryCacheBackend, ResponseCache, ShelveCacheBackend
+
+
+def test_cache_keys_by_user():
+    cache = ResponseCache({'core_get_hw_types': 60})
+    cache.set('core_get_hw_types', 'key', 'first', user=1)
+    cache.set('core_get_hw_types', 'key', 'second', user=2)
+    assert cache.get('core_get_hw_types', 'key', 1) == (True, 'first')
+    assert cache.get('core_get_hw_types', 'key', 2) == (True, 'second')
+    assert cache.get('core_get_hw_types', 'key', 3) == (False, None)
+    assert cache.get('core_get_hw_types', 'key') == (False, None)
+    assert cache.stats() == {'hits': 2, 'misses': 2}
+
+
+def test_cache_invalidate():
+    cache = ResponseCache({'core_search_item': 60, 'core_get_hw_types': 60})
+    cache.set('core_search_item', '{"id":1}', 1, user=1)
+    cache.set('core_search_item', '{"id":1}', 1, user=2)
+    cache.set('core_search_item', '{"id":2}', 2, user=2)
+    cache.set('core_get_hw_types', '{}', [], user=2)
+    cache.invalidate('core_search_item', {'id': 1}, user=1)
+    assert not cache.get('core_search_item', '{"id":1}', 1)[0]
+    assert cache.get('core_search_item', '{"id":1}', 2)[0]
+    cache.invalidate('core_search_item', {'id': 1})
+    assert not cache.get('core_search_item', '{"id":1}', 2)[0]
+    assert cache.get('core_search_item', '{"id":2}', 2)[0]
+    cache.invalidate(user=2)
+    assert len(cache.backend) == 0
+
+
+def test_cache_ttl_and_copies():
+    cache = ResponseCache({'a': 0.01, 'b': 0})
+    cache.set('a', 'key', {'value': [1]})
+    _, value = cache.get('a', 'key')
+    value['value'].append(2)
+    assert cache.get('a', 'key') == (True, {'value': [1]})
+    cache.set('b', 'key', 1)
+    assert not cache.is_cached('b') and cache.get('b', 'key') == (False, None)
+    time.sleep(0.02)
+    assert cache.get('a', 'key') == (False, None)
+
+
+def test_memory_backend_lru():
+    backend = MemoryCacheBackend(maxsize=2)
+    backend.set('a', (0, 1))
+    backend.set('b', (0, 2))
+    backend.get('a')
+    backend.set('c', (0, 3))
+    assert list(backend.keys()) == ['a', 'c']
+
+
+def test_shelve_backend(tmp_path):
+    backend = ShelveCacheBackend(str(tmp_path / 'cache'))
+    cache = ResponseCache({'a': 60}, backend=backend, namespace='ns')
+    cache.set('a', 'key', {'value': 1}, user=1)
+    assert cache.get('a', 'key', 1) == (True, {'value': 1})
+    cache.invalidate()
+    assert cache.get('a', 'key', 1) == (False, None)
+    backend.close()
+
+
+def test_clients_of_different_users_share_cache(fake):
+    async def main():
+        fake.handlers['token/login'] = (
+            lambda params, sid: {'eid': 'sid-' + params['token'], 'user': {'id': params['token']}}
+        )
+        fake.handlers['core/get_hw_types'] = lambda params, sid: [sid]
+        cache = ResponseCache()
+        async with fake:
+            first, second = fake.client(cache=cache), fake.client(cache=cache)
+            await first.login(token='1')
+            await second.login(token='2')
+            results = [await first.core_get_hw_types(filterType='id'),
+                       await second.core_get_hw_types(filterType='id'),
+                       await first.core_get_hw_types(filterType='id')]
+            await first.close()
+            await second.close()
+        assert results == [['sid-1'], ['sid-2'], ['sid-1']]
+        assert cache.stats() == {'hits': 1, 'misses': 2}
+
+    asyncio.run(main())
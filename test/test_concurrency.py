@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from aiowialon.utils.concurrency import ConcurrencyLimiter, GradientConcurrencyLimiter
+
+
+def test_limiter_admits_up_to_limit_in_order():
+    order = []
+
+    async def job(limiter, n):
+        async with limiter:
+            order.append(n)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        limiter = ConcurrencyLimiter(2)
+        tasks = [asyncio.ensure_future(job(limiter, n)) for n in range(5)]
+        await asyncio.sleep(0)
+        assert limiter.stats() == {'limit': 2, 'inflight': 2, 'waiting': 3}
+        limiter.limit = 3
+        assert limiter.inflight == 3 and limiter.waiting == 2
+        await asyncio.gather(*tasks)
+        assert limiter.inflight == 0
+
+    asyncio.run(main())
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_limiter_cancelled_waiter_passes_slot():
+    async def main():
+        limiter = ConcurrencyLimiter(1)
+        await limiter.acquire()
+        cancelled = asyncio.ensure_future(limiter.acquire())
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        # admitted and cancelled at once
+        limiter.release()
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        await asyncio.wait_for(waiting, 1)
+        assert limiter.inflight == 1 and limiter.waiting == 0
+
+    asyncio.run(main())
+
+
+def test_gradient_limiter_grows_while_latency_is_flat():
+    limiter = GradientConcurrencyLimiter(10, 1, 50)
+    for _ in range(100):
+        limiter._inflight = limiter.limit
+        limiter.on_sample(0.1)
+    assert limiter.limit > 10
+
+
+def test_gradient_limiter_shrinks_on_queueing_and_drops():
+    limiter = GradientConcurrencyLimiter(40, 5, 50)
+    for _ in range(100):
+        limiter._inflight = limiter.limit
+        limiter.on_sample(0.1)
+    grown = limiter.limit
+    for _ in range(100):
+        limiter._inflight = limiter.limit
+        limiter.on_sample(1.0)
+    assert limiter.limit < grown
+    shrunk = limiter.limit
+    limiter.on_sample(1.0, dropped=True)
+    assert limiter.limit <= shrunk
+    for _ in range(100):
+        limiter.on_sample(1.0, dropped=True)
+    assert limiter.limit == 5
+
+
+def test_gradient_limiter_ignores_unused_limit():
+    limiter = GradientConcurrencyLimiter(20, 1, 50)
+    for _ in range(100):
+        limiter.on_sample(0.1)
+    assert limiter.limit == 20
+    with pytest.raises(ValueError):
+        GradientConcurrencyLimiter(10, 20, 50)
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from aiowialon import AvlEvent
+from aiowialon.utils.events import EventQueue
+
+
+def event(item, t='u', n=0):
+    return AvlEvent(1, {'i': item, 't': t, 'd': {'n': n}})
+
+
+def numbers(events):
+    return [(e.data.i, e.data.d['n']) for e in events]
+
+
+def test_block_policy_waits_for_free_slot():
+    async def main():
+        queue = EventQueue(2)
+        await queue.put(event(1, n=1))
+        await queue.put(event(1, n=2))
+        putter = asyncio.ensure_future(queue.put(event(1, n=3)))
+        await asyncio.sleep(0)
+        assert not putter.done() and queue.stats()['blocked'] == 1
+        assert numbers([await queue.get()]) == [(1, 1)]
+        await putter
+        return numbers([await queue.get(), await queue.get()])
+
+    assert asyncio.run(main()) == [(1, 2), (1, 3)]
+
+
+def test_drop_oldest_policy():
+    async def main():
+        queue = EventQueue(2, overflow='drop_oldest')
+        for n in range(4):
+            await queue.put(event(n, n=n))
+        assert queue.stats()['dropped'] == 2
+        return numbers(await queue.get_batch(10))
+
+    assert asyncio.run(main()) == [(2, 2), (3, 3)]
+
+
+def test_coalesce_policy():
+    async def main():
+        queue = EventQueue(2, overflow='coalesce')
+        await queue.put(event(1, n=1))
+        await queue.put(event(2, n=1))
+        await queue.put(event(1, n=2))
+        assert queue.stats()['coalesced'] == 1
+        putter = asyncio.ensure_future(queue.put(event(3, n=1)))
+        await asyncio.sleep(0)
+        assert not putter.done()
+        first = await queue.get()
+        await putter
+        return numbers([first] + await queue.get_batch(10))
+
+    assert asyncio.run(main()) == [(1, 2), (2, 1), (3, 1)]
+
+
+def test_ordered_sharding():
+    async def main():
+        queue = EventQueue(100, workers=3, ordered=True)
+        for n in range(9):
+            await queue.put(event(n % 3, n=n))
+        return [numbers(await queue.get_batch(10, worker)) for worker in range(3)]
+
+    assert asyncio.run(main()) == [[(0, 0), (0, 3), (0, 6)],
+                                   [(1, 1), (1, 4), (1, 7)],
+                                   [(2, 2), (2, 5), (2, 8)]]
+
+
+def test_drop_oldest_between_shards():
+    async def main():
+        queue = EventQueue(2, overflow='drop_oldest', workers=2, ordered=True)
+        await queue.put(event(1, n=1))
+        await queue.put(event(0, n=2))
+        await queue.put(event(0, n=3))
+        assert queue.qsize() == 2 and queue.stats()['dropped'] == 1
+        return numbers(await queue.get_batch(10, 0))
+
+    assert asyncio.run(main()) == [(0, 2), (0, 3)]
+
+
+def test_closed_queue_is_drained_then_ends():
+    async def main():
+        queue = EventQueue()
+        waiting = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        queue.close()
+        assert await asyncio.wait_for(waiting, 1) is None
+        assert await queue.get_batch(10) == []
+
+        queue = EventQueue()
+        await queue.put(event(1))
+        queue.close()
+        await queue.put(event(2))
+        assert numbers([await queue.get()]) == [(1, 0)]
+        assert await queue.get() is None
+
+    asyncio.run(main())
+
+
+def test_join_waits_for_task_done():
+    async def main():
+        queue = EventQueue()
+        await queue.put(event(1))
+        joiner = asyncio.ensure_future(queue.join())
+        await queue.get()
+        await asyncio.sleep(0)
+        assert not joiner.done()
+        queue.task_done()
+        await asyncio.wait_for(joiner, 1)
+        assert queue.stats()['processed'] == 1
+
+    asyncio.run(main())
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        EventQueue(0)
+    with pytest.raises(ValueError):
+        EventQueue(workers=0)
+    with pytest.raises(ValueError):
+        EventQueue(overflow='unknown')  # type: ignore[arg-type]
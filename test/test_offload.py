@@ -0,0 +1,68 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from aiowialon import AvlEvent
+from aiowialon.utils.offload import ProcessOffload
+
+
+def item_pid(event):
+    if event.data.d.get('crash'):
+        os._exit(1)
+    return event.data.i, os.getpid()
+
+
+def event(item, **d):
+    return AvlEvent(1, {'i': item, 't': 'u', 'd': d})
+
+
+def test_offload_keeps_items_affinity():
+    async def main():
+        offload = ProcessOffload(item_pid, 2, delay=0.001)
+        try:
+            return await asyncio.gather(*[offload.submit(event(i % 4)) for i in range(20)])
+        finally:
+            offload.close()
+
+    results = asyncio.run(main())
+    pids = {}
+    for item, pid in results:
+        assert pids.setdefault(item, pid) == pid
+    assert pids[0] == pids[2] and pids[1] == pids[3]
+
+
+def test_offload_recovers_broken_worker():
+    async def main():
+        offload = ProcessOffload(item_pid, 1, delay=0.001)
+        try:
+            first = await offload.submit(event(1))
+            with pytest.raises(BrokenProcessPool):
+                await offload.submit(event(1, crash=True))
+            second = await offload.submit(event(1))
+        finally:
+            offload.close()
+        assert first[1] != second[1]
+
+    asyncio.run(main())
+
+
+def test_client_close_shuts_offload_down(fake):
+    async def main():
+        offload = ProcessOffload(item_pid, 1, delay=0.001)
+        wialon = fake.client()
+
+        @wialon.avl_event_handler(offload=offload)
+        async def handler(event, result):
+            pass
+
+        await offload.submit(event(1))
+        processes = list(offload._executors[0]._processes.values())
+        await wialon.close()
+        assert offload._executors == [None]
+        for process in processes:
+            process.join(5)
+            assert not process.is_alive()
+
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+import asyncio
+import gzip
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from aiowialon.utils.recording import EventsRecorder, EventsReplay, read_recording
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def record(path, first, count, compress=True):
+    async def main():
+        recorder = EventsRecorder(path, compress=compress)
+        for n in range(first, first + count):
+            await recorder.record({'tm': n, 'events': [{'i': n}]})
+        await recorder.close()
+        return recorder.stats()
+
+    return asyncio.run(main())
+
+
+def recorded(path):
+    return [response['tm'] for _, response in read_recording(path)]
+
+
+def crash_recording(path, count):
+    """Records the responses in the process killed after the flush"""
+
+    script = textwrap.dedent(f"""
+        import asyncio, os
+        from aiowialon.utils.recording import EventsRecorder
+
+        async def main():
+            recorder = EventsRecorder({path!r})
+            for n in range({count}):
+                await recorder.record({{'tm': n, 'events': []}})
+            await recorder.flush()
+            os._exit(0)
+
+        asyncio.run(main())
+    """)
+    subprocess.run([sys.executable, '-c', script], check=True,
+                   env={**os.environ, 'PYTHONPATH': ROOT})
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_recording_round_trip(tmp_path, compress):
+    path = str(tmp_path / 'avl_evts.jsonl')
+    assert record(path, 0, 3, compress) == {'records': 3, 'events': 3}
+    record(path, 3, 2, compress)
+    assert recorded(path) == [0, 1, 2, 3, 4]
+
+
+def test_recording_append_after_crash(tmp_path):
+    path = str(tmp_path / 'avl_evts.jsonl.gz')
+    crash_recording(path, 5)
+    assert recorded(path) == [0, 1, 2, 3, 4]
+    record(path, 5, 3)
+    assert recorded(path) == list(range(8))
+    record(path, 8, 1)
+    assert recorded(path) == list(range(9))
+
+
+def test_recording_append_after_truncated_write(tmp_path):
+    path = str(tmp_path / 'avl_evts.jsonl.gz')
+    crash_recording(path, 50)
+    with open(path, 'r+b') as file:
+        file.truncate(os.path.getsize(path) - 3)
+    complete = recorded(path)
+    assert complete == list(range(len(complete)))
+    record(path, 100, 2)
+    assert recorded(path) == complete + [100, 101]
+
+
+def test_plain_recording_append_after_partial_line(tmp_path):
+    path = str(tmp_path / 'avl_evts.jsonl')
+    record(path, 0, 2, compress=False)
+    with open(path, 'ab') as file:
+        file.write(b'{"t": 1, "r": {"tm"')
+    assert recorded(path) == [0, 1]
+    record(path, 2, 1, compress=False)
+    assert recorded(path) == [0, 1, 2]
+
+
+def test_recorder_close_waits_for_write(tmp_path):
+    path = str(tmp_path / 'avl_evts.jsonl.gz')
+
+    async def main():
+        recorder = EventsRecorder(path)
+        task = asyncio.ensure_future(recorder.record({'tm': 0, 'events': []}))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await recorder.close()
+
+    asyncio.run(main())
+    assert recorded(path) == [0]
+
+
+def test_replay(tmp_path):
+    path = str(tmp_path / 'avl_evts.jsonl.gz')
+    record(path, 0, 3)
+
+    async def main():
+        return [response['tm'] async for response in EventsReplay(path, speed=None)]
+
+    assert asyncio.run(main()) == [0, 1, 2]
+    with pytest.raises(ValueError):
+        EventsReplay(path, speed=0)
+
+
+def test_read_gzip_without_trailer(tmp_path):
+    path = str(tmp_path / 'avl_evts.jsonl.gz')
+    record(path, 0, 2)
+    with open(path, 'rb') as file:
+        data = file.read()
+    with open(path, 'wb') as file:
+        file.write(data[:-8])
+    assert recorded(path) == [0, 1]
+    assert gzip.decompress(data).count(b'\n') == 2
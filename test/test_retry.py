@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from aiowialon import WialonError
+from aiowialon.utils.retry import RetryPolicy
+from aiowialon.utils.timeouts import effective_timeout, request_timeout
+
+
+def test_retry_transient_errors():
+    attempts = []
+
+    async def factory():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise WialonError(5, 'core_search_item')
+        return 'ok'
+
+    policy = RetryPolicy(3, base_delay=0, actions={'core_search_item'})
+    assert asyncio.run(policy.call('core_search_item', factory)) == 'ok'
+    assert len(attempts) == 3 and policy.retries == 2
+
+
+def test_retry_skips_fatal_errors_and_other_actions():
+    attempts = []
+
+    async def factory():
+        attempts.append(1)
+        raise WialonError(7, 'core_search_item')
+
+    policy = RetryPolicy(3, base_delay=0, actions={'core_search_item'})
+    with pytest.raises(WialonError):
+        asyncio.run(policy.call('core_search_item', factory))
+    with pytest.raises(WialonError):
+        asyncio.run(policy.call('item_update_name', factory))
+    assert len(attempts) == 2 and policy.retries == 0
+
+
+def test_retry_deadline_limits_each_attempt():
+    timeouts = []
+
+    async def factory():
+        timeout = effective_timeout(30)
+        timeouts.append(timeout)
+        await asyncio.sleep(timeout)
+        raise asyncio.TimeoutError()
+
+    async def main():
+        policy = RetryPolicy(5, base_delay=0.01, jitter=False, deadline=0.2, actions={'a'})
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await policy.call('a', factory)
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(main())
+    assert elapsed < 0.5
+    assert len(timeouts) == 1 and timeouts[0] <= 0.2
+
+
+def test_retry_deadline_limited_by_caller_scope():
+    timeouts = []
+
+    async def factory():
+        timeouts.append(effective_timeout(30))
+        raise WialonError(5, 'a')
+
+    async def main():
+        policy = RetryPolicy(2, base_delay=0, deadline=10, actions={'a'})
+        with request_timeout(deadline=0.5), pytest.raises(WialonError):
+            await policy.call('a', factory)
+
+    asyncio.run(main())
+    assert len(timeouts) == 2 and all(timeout <= 0.5 for timeout in timeouts)
+
+
+def test_client_retries_read_only_calls(fake):
+    async def main():
+        failures = [{'error': 5}]
+        fake.handlers['core/search_item'] = (
+            lambda params, sid: failures.pop() if failures else {'item': params['id']}
+        )
+        async with fake:
+            wialon = fake.client(retry=RetryPolicy(3, base_delay=0))
+            await wialon.login()
+            result = await wialon.core_search_item(id=1, flags=1)
+            await wialon.close()
+        assert result == {'item': 1}
+        assert fake.svcs() == ['token/login', 'core/search_item', 'core/search_item']
+
+    asyncio.run(main())
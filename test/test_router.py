@@ -0,0 +1,82 @@
+import asyncio
+
+from aiowialon import AvlEvent, AvlEventSpec
+from aiowialon.types.avl_events import AvlEventHandler, AvlEventRouter
+from aiowialon.utils.recording import EventsRecorder, EventsReplay
+
+
+def handler(spec=None):
+    async def callback(event):
+        return event
+
+    return AvlEventHandler(callback, spec=spec)
+
+
+def event(i, t='m', d=None):
+    return AvlEvent(1, {'i': i, 't': t, 'd': d or {}})
+
+
+def test_candidates_in_registration_order():
+    router = AvlEventRouter()
+    wildcard = handler()
+    by_type = handler(AvlEventSpec(types={'m'}))
+    by_item = handler(AvlEventSpec(items={1, 2}))
+    other_item = handler(AvlEventSpec(items={3}))
+    late_wildcard = handler()
+    for h in (wildcard, by_type, by_item, other_item, late_wildcard):
+        router.add(h)
+    assert len(router) == 5
+    assert list(router.candidates(event(1))) == [wildcard, by_type, by_item, late_wildcard]
+    assert list(router.candidates(event(1, 'u'))) == [wildcard, by_item, late_wildcard]
+    assert list(router.candidates(event(3, 'u'))) == [wildcard, other_item, late_wildcard]
+
+
+def test_remove_drops_empty_buckets():
+    router = AvlEventRouter()
+    by_item = handler(AvlEventSpec(items={1}))
+    router.add(by_item)
+    router.remove(by_item)
+    router.remove(by_item)
+    assert not router
+    assert not list(router.candidates(event(1)))
+    assert not router._by_item  # pylint: disable=protected-access
+
+
+def test_spec_matches():
+    spec = AvlEventSpec(items={1}, message_types={'ud'}, flags=0b10)
+    assert spec.matches(event(1, d={'tp': 'ud', 'f': 0b11}))
+    assert not spec.matches(event(1, d={'tp': 'ud', 'f': 0b01}))
+    assert not spec.matches(event(1, d={'tp': 'evt', 'f': 0b10}))
+    assert not spec.matches(event(1, 'u', {'tp': 'ud', 'f': 0b10}))
+    assert not spec.matches(event(2, d={'tp': 'ud', 'f': 0b10}))
+    assert AvlEventSpec(types={'u'}).matches(event(5, 'u'))
+
+
+def test_first_matching_handler_wins(fake, tmp_path):
+    path = str(tmp_path / 'events.jsonl.gz')
+    handled = []
+
+    async def main():
+        recorder = EventsRecorder(path)
+        await recorder.record({'tm': 1, 'events': [{'i': 1, 't': 'm', 'd': {}},
+                                                   {'i': 2, 't': 'u', 'd': {}}]})
+        await recorder.close()
+        wialon = fake.client()
+
+        @wialon.avl_event_handler(spec=AvlEventSpec(types={'u'}))
+        async def updates(e):
+            handled.append(('updates', e.data.i))
+
+        @wialon.avl_event_handler(spec=AvlEventSpec(items={1, 2}))
+        async def items(e):
+            handled.append(('items', e.data.i))
+
+        @wialon.avl_event_handler()
+        async def rest(e):
+            handled.append(('rest', e.data.i))
+
+        assert await wialon.replay_events(EventsReplay(path, speed=None)) == 2
+        await wialon.close()
+
+    asyncio.run(main())
+    assert sorted(handled) == [('items', 1), ('updates', 2)]
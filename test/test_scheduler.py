@@ -0,0 +1,60 @@
+import asyncio
+
+from aiowialon import Wialon
+from aiowialon.utils.scheduler import PriorityScheduler, RequestPriority, current_priority
+
+REALTIME, INTERACTIVE, BULK = RequestPriority
+
+
+def test_scheduler_weighted_order():
+    admitted = []
+
+    async def job(scheduler, priority):
+        await scheduler.acquire(priority)
+        admitted.append(priority)
+        await asyncio.sleep(0)
+        scheduler.release()
+
+    async def main():
+        scheduler = PriorityScheduler({REALTIME: 4, INTERACTIVE: 2, BULK: 1})
+        await scheduler.acquire()
+        tasks = [asyncio.ensure_future(job(scheduler, priority))
+                 for priority in [BULK] * 7 + [INTERACTIVE] * 7 + [REALTIME] * 7]
+        await asyncio.sleep(0)
+        assert scheduler.stats() == {'realtime': 7, 'interactive': 7, 'bulk': 7}
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    # smooth weighted round-robin 4:2:1 while all the classes wait, the lower ones still progress
+    assert ''.join(priority.name[0] for priority in admitted) == 'RIRBRIRRIRBRIIIIBBBBB'
+
+
+def test_scheduler_cancelled_waiter():
+    async def main():
+        scheduler = PriorityScheduler()
+        await scheduler.acquire()
+        cancelled = asyncio.ensure_future(scheduler.acquire(BULK))
+        waiting = asyncio.ensure_future(scheduler.acquire(BULK))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.qsize(BULK) == 1
+        scheduler.release()
+        await asyncio.wait_for(waiting, 1)
+        assert scheduler.qsize() == 0
+
+    asyncio.run(main())
+
+
+def test_request_priority_context():
+    async def main():
+        assert current_priority.get() == INTERACTIVE
+        with Wialon.request_priority(BULK):
+            assert await asyncio.ensure_future(_priority()) == BULK
+        assert current_priority.get() == INTERACTIVE
+
+    async def _priority():
+        return current_priority.get()
+
+    asyncio.run(main())
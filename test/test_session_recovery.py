@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from aiowialon import WialonInvalidSession
+
+
+class Sessions:
+    """Each login opens the new session, the sessions listed in 'lost' are invalid"""
+
+    def __init__(self, fake):
+        self.opened = 0
+        self.lost = set()
+        fake.handlers['token/login'] = self.login
+        fake.handlers['core/search_item'] = self.check
+        fake.handlers['core/update_data_flags'] = self.check
+
+    def login(self, params, sid):
+        self.opened += 1
+        return {'eid': f'sid-{self.opened}', 'user': {'id': 1}}
+
+    def check(self, params, sid):
+        if sid in self.lost:
+            return {'error': 1}
+        return {'sid': sid, 'params': params}
+
+
+def test_lost_session_call_replayed_after_relogin(fake):
+    async def main():
+        sessions = Sessions(fake)
+        async with fake:
+            wialon = fake.client(auto_relogin=True)
+            await wialon.login()
+            sessions.lost.add('sid-1')
+            results = await asyncio.gather(*[wialon.core_search_item(id=i, flags=1)
+                                             for i in range(3)])
+            await wialon.close()
+        assert sessions.opened == 2
+        assert [result['sid'] for result in results] == ['sid-2'] * 3
+
+    asyncio.run(main())
+
+
+def test_subscriptions_restored_after_relogin(fake):
+    async def main():
+        sessions = Sessions(fake)
+        spec = [{'type': 'id', 'data': 734455, 'flags': 1, 'mode': 0}]
+        async with fake:
+            wialon = fake.client(auto_relogin=True)
+            await wialon.login()
+            await wialon.core_update_data_flags(spec=spec)
+            sessions.lost.add('sid-1')
+            await wialon.core_search_item(id=1, flags=1)
+            await wialon.close()
+        restored = [(params, sid) for svc, params, sid in fake.calls
+                    if svc == 'core/update_data_flags' and sid == 'sid-2']
+        assert restored == [({'spec': spec}, 'sid-2')]
+
+    asyncio.run(main())
+
+
+def test_lost_session_raised_without_relogin(fake):
+    async def main():
+        sessions = Sessions(fake)
+        async with fake:
+            wialon = fake.client()
+            await wialon.login()
+            sessions.lost.add('sid-1')
+            with pytest.raises(WialonInvalidSession):
+                await wialon.core_search_item(id=1, flags=1)
+            await wialon.close()
+        assert sessions.opened == 1
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from aiowialon.utils.singleflight import SingleFlight
+
+
+def test_single_flight_shares_call():
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'n': len(calls)}
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do('key', factory) for _ in range(5)])
+        assert flight.inflight == 0
+        return results
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+
+
+def test_single_flight_shares_error_and_survives_cancel():
+    async def factory():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def main():
+        flight = SingleFlight()
+        cancelled = asyncio.ensure_future(flight.do('key', factory))
+        waiter = asyncio.ensure_future(flight.do('key', factory))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(ValueError):
+            await waiter
+
+    asyncio.run(main())
+
+
+def test_single_flight_coalesces_client_calls(fake):
+    async def main():
+        fake.delay = 0.01
+        async with fake:
+            wialon = fake.client(single_flight=True)
+            await wialon.login()
+            await asyncio.gather(*[wialon.core_search_item(id=1, flags=1) for _ in range(5)])
+            await wialon.close()
+        assert fake.svcs() == ['token/login', 'core/search_item']
+
+    asyncio.run(main())
+
+
+def test_single_flight_under_session_lock(fake):
+    async def main():
+        async with fake:
+            wialon = fake.client(single_flight=True)
+            await wialon.login()
+
+            @wialon.session_lock
+            async def locked():
+                return await wialon.core_search_item(id=1, flags=1)
+
+            result = await asyncio.wait_for(locked(), 5)
+            await wialon.close()
+        assert result == {'svc': 'core/search_item', 'params': {'id': 1, 'flags': 1}}
+
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+import asyncio
+
+from aiowialon import AvlEvent
+from aiowialon.utils.recording import EventsRecorder, EventsReplay
+from aiowialon.utils.store import ItemStore
+
+SUBSCRIBED = [
+    {'i': 1, 'd': {'id': 1, 'nm': 'Truck 1', 'cls': 2}},
+    {'i': 2, 'd': {'id': 2, 'nm': 'Truck 2', 'cls': 2}},
+    {'i': 3, 'd': {'id': 3, 'nm': 'Admin', 'cls': 1}},
+]
+
+
+def event(i, t, d=None):
+    return AvlEvent(1, {'i': i, 't': t, 'd': d})
+
+
+def test_seed_and_find():
+    store = ItemStore(index=('cls', 'nm'))
+    store.seed(SUBSCRIBED)
+    assert len(store) == 3 and 2 in store and list(store) == [1, 2, 3]
+    assert [item['id'] for item in store.find(cls=2)] == [1, 2]
+    assert store.find(cls=2, nm='Truck 2') == [store.get(2)]
+    assert store.find(cls=2, nm='Admin') == []
+    store.seed([{'i': 2, 'd': None}, 'garbage'])
+    assert 2 not in store and store.find(nm='Truck 2') == []
+
+
+def test_apply_deltas():
+    store = ItemStore(index=('nm',))
+    store.seed(SUBSCRIBED)
+    store.apply(event(1, 'u', {'nm': 'Truck 10'}))
+    assert store.find(nm='Truck 1') == []
+    assert store.find(nm='Truck 10') == [{'id': 1, 'nm': 'Truck 10', 'cls': 2}]
+    store.apply(event(2, 'm', {'t': 50, 'tp': 'ud', 'pos': {'x': 1, 'y': 2}}))
+    item = store.get(2)
+    assert item['pos'] == {'x': 1, 'y': 2, 't': 50} and item['lmsg']['tp'] == 'ud'
+    store.apply(event(3, 'd'))
+    assert 3 not in store
+    # the events of the not subscribed items are ignored
+    store.apply(event(9, 'u', {'nm': 'Ghost'}))
+    assert 9 not in store
+    assert store.stats() == {'items': 2, 'events': 2, 'indexes': {'nm': 2}}
+    store.clear()
+    assert not store and store.stats()['indexes'] == {'nm': 0}
+
+
+def test_change_callbacks():
+    store = ItemStore()
+    changes = []
+
+    @store.on_change
+    def changed(item_id, change, item):
+        changes.append((item_id, change, item.get('nm')))
+
+    @store.on_change
+    def failing(*_):
+        raise ValueError
+
+    store.seed(SUBSCRIBED[:1])
+    store.apply(event(1, 'u', {'nm': 'Renamed'}))
+    store.apply(event(1, 'd'))
+    store.remove_callback(changed)
+    store.seed(SUBSCRIBED[:1])
+    assert changes == [(1, 'seed', 'Truck 1'), (1, 'update', 'Renamed'), (1, 'delete', 'Renamed')]
+
+
+def test_client_keeps_store_current(fake, tmp_path):
+    path = str(tmp_path / 'events.jsonl.gz')
+    fake.handlers['core/update_data_flags'] = lambda params, sid: SUBSCRIBED
+
+    async def main():
+        recorder = EventsRecorder(path)
+        await recorder.record({'tm': 2, 'events': [{'i': 1, 't': 'u', 'd': {'nm': 'Truck 10'}},
+                                                   {'i': 3, 't': 'd'}]})
+        await recorder.close()
+        store = ItemStore(index=('nm',))
+        async with fake:
+            wialon = fake.client(item_store=store)
+            await wialon.login()
+            await wialon.core_update_data_flags(spec=[], flags=1)
+            assert len(store) == 3
+            seen = []
+
+            @wialon.avl_event_handler()
+            async def handler(e):
+                seen.append(wialon.item_store.get(e.data.i))
+
+            await wialon.replay_events(EventsReplay(path, speed=None))
+            await wialon.close()
+        # the handlers see the items already updated
+        assert seen[0]['nm'] == 'Truck 10'
+        assert sorted(store) == [1, 2]
+
+    asyncio.run(main())